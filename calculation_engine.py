@@ -5,12 +5,18 @@ AQL/LTPD設計に基づく抜取検査計算
 """
 
 import math
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
 from functools import lru_cache
+from types import MappingProxyType
 from typing import Any, Callable
 
+import numpy as np
+
 from constants import InspectionConstants, DEFECT_COLUMNS
 
-SAMPLE_SIZE_CACHE_LIMIT = 128
+SAMPLE_SIZE_CACHE_LIMIT = 512
 OC_DEFECT_RATE_POINTS = (
     0.0,
     0.1,
@@ -23,6 +29,7 @@ OC_DEFECT_RATE_POINTS = (
     5.0,
     10.0,
 )
+_OC_DEFECT_RATES = np.array(OC_DEFECT_RATE_POINTS) / 100.0
 
 
 def _coerce_numeric_input(
@@ -76,40 +83,421 @@ INSPECTION_COMMENT_PRESETS = {
     }
 }
 
+# 各プリセットは共有されるため読み取り専用にしておく
+INSPECTION_COMMENT_PRESETS = {
+    key: MappingProxyType(preset) for key, preset in INSPECTION_COMMENT_PRESETS.items()
+}
+
 INSPECTION_COMMENT_BY_LABEL = {
     preset["label"]: preset for preset in INSPECTION_COMMENT_PRESETS.values()
 }
-_DEFECT_SUM_SQL = ", ".join(
-    f"SUM(IIF([{col}] IS NOT NULL AND [{col}]<>0, [{col}], 0))" for col in DEFECT_COLUMNS
-)
+# 検査モード未指定時の AQL による区分（AQL <= 0.1 → 強化、<= 0.4 → 標準、それ以上 → 緩和）
+_FALLBACK_AQL_THRESHOLDS = (0.1, 0.4)
+_FALLBACK_MODE_KEYS = ("tightened", "standard", "reduced")
+# 実績不良率(%)による AQL/LTPD 調整係数（rate <= 閾値 となる最初の区分の係数を使う）
+# <= 0.1: 軽微な厳格化 / <= 0.5: 微調整 / <= 1.0: 調整なし / <= 2.0: 軽微な緩和 / それ以上: 適度な緩和
+_HISTORY_RATE_THRESHOLDS = (0.1, 0.5, 1.0, 2.0)
+_HISTORY_ADJUSTMENT_FACTORS = (1.05, 1.02, 1.0, 0.95, 0.90)
+# 抜取数が算出できなかった場合の結果（同一オブジェクトかどうかで判定する）
+_SAMPLE_SIZE_ERROR_RESULT = ("計算エラー", "AQL/LTPDの値が無効です。")
+# SUM は NULL を無視し 0 は合計に影響しないため、IIF による行ごとの分岐は不要
+# （全行 NULL の列は NULL が返るが、fetch_data 側で 0 として扱う）
+# 角括弧で囲んだ列名は一度だけ作り、SQL の組み立てではこれを使う
+_ESCAPED_DEFECT_COLUMNS = tuple(f"[{col}]" for col in DEFECT_COLUMNS)
+_DEFECT_SUM_SQL = ", ".join(f"SUM({col})" for col in _ESCAPED_DEFECT_COLUMNS)
 _BASE_DEFECT_AGGREGATE_SQL = (
     f"SELECT SUM([数量]), SUM([総不具合数]), {_DEFECT_SUM_SQL} FROM t_不具合情報 WHERE [品番] = ?"
 )
+# 並べ替え結果のインデックスでまとめて引けるよう、項目名を配列として保持する
+_DEFECT_COLUMN_ARRAY = np.array(DEFECT_COLUMNS, dtype=object)
+# 期間指定の有無（開始日あり, 終了日あり）ごとに確定済みの SQL を保持する
+_DEFECT_AGGREGATE_SQL_VARIANTS = {
+    (has_start, has_end): " ".join(
+        [_BASE_DEFECT_AGGREGATE_SQL]
+        + (["AND [指示日] >= ?"] if has_start else [])
+        + (["AND [指示日] <= ?"] if has_end else [])
+    )
+    for has_start in (False, True)
+    for has_end in (False, True)
+}
+
+
+_ALTERNATIVES_RECOMMENDATION_TEXT = (
+    "【推奨案】\n"
+    "現在の条件では統計的に適切な抜取検査が困難です。\n"
+    "以下のいずれかを検討してください:\n\n"
+    "• AQLを0.4%以上に緩和する\n"
+    "• LTPDを1.5%以上に設定する\n"
+    "• α（生産者危険）を10%以上に設定する\n"
+    "• c値を1以上に設定する\n"
+    "• 全数検査の実施\n\n"
+    "※ ISO 2859-1標準に基づく推奨値:\n"
+    "   AQL=0.25%, LTPD=1.0%, α=5%, β=10%, c=0 → n≈230\n"
+    "※ 品質要求に応じて最適な条件を選択してください。"
+)
+
+_GUIDANCE_STANDARD_TEXT = (
+    "【ISO 2859-1標準の推奨値】\n"
+    "• AQL=0.25%, LTPD=1.0%, α=5%, β=10%, c=0 → 抜取数≈230個\n"
+    "• 小ロット（<1000個）では全数検査も検討してください\n\n"
+    "※ 品質要求に応じて最適な条件を選択してください。"
+)
 
 
-_BINOM = None
-_HYPERGEOM = None
+# scipy.special の関数オブジェクト（初回使用時に _load_scipy_special でまとめて束縛する）
+_BDTR = None
+_CHDTRI = None
 
 
-def _ensure_scipy_distributions():
-    global _BINOM, _HYPERGEOM
-    if _BINOM is None or _HYPERGEOM is None:
-        from scipy.stats import binom as sp_binom, hypergeom as sp_hypergeom
-        _BINOM = sp_binom
-        _HYPERGEOM = sp_hypergeom
-    return _BINOM, _HYPERGEOM
+def _load_scipy_special():
+    # 二項分布なども scipy.special だけで計算できるため、重い scipy.stats は読み込まない。
+    # 呼び出し側は `if _BDTR is None` で判定した後、グローバルの関数を直接呼ぶ
+    global _BDTR, _CHDTRI
+    from scipy.special import bdtr, chdtri
+    _BDTR, _CHDTRI = bdtr, chdtri
 
 
 @lru_cache(maxsize=512)
 def _cached_binom_cdf(c_value, sample_size, defect_rate):
-    binom, _ = _ensure_scipy_distributions()
-    return binom.cdf(c_value, sample_size, defect_rate)
+    # binom.cdf と同値だが、分布オブジェクトの引数検査を経由しない C 実装を直接呼ぶ
+    # （bdtr は c >= n で nan を返すため、その範囲は確率1として先に処理する）
+    if c_value >= sample_size:
+        return 1.0
+    if c_value == 0:
+        # c=0 は閉形式 (1 - p)^n（bdtr の k=0 の計算と同一）で求め、SciPy を呼ばない
+        return (1.0 - defect_rate) ** sample_size
+    if _BDTR is None:
+        _load_scipy_special()
+    return _BDTR(c_value, sample_size, defect_rate)
+
+
+# P(0) を直接の積で求める項数の上限（これを超える場合は lgamma で求める）
+_HYPERGEOM_PRODUCT_TERMS = 512
+
+
+def _hypergeom_cdf(c_value, population_size, defect_count, sample_size):
+    """超幾何分布の累積確率 P(X <= c)
+
+    hypergeom.cdf の分布オブジェクト処理を通さず、台の下端 k0 = max(0, n - (N - D)) の
+    PMF だけを求め、以降は漸化式
+    P(k + 1) = P(k) * (D - k)(n - k) / ((k + 1)(N - D - n + k + 1))
+    で k = k0..c の項を足し合わせる（c = 0 なら1項のみ）。
+    """
+    others = population_size - defect_count
+    k_min = max(0, sample_size - others)
+    if c_value < k_min:
+        return 0.0
+
+    terms = min(defect_count, sample_size)
+    if k_min == 0 and terms <= _HYPERGEOM_PRODUCT_TERMS:
+        # P(0) = Π_{i < min(D, n)} (N - max(D, n) - i) / (N - i)
+        # （lgamma の差より丸め誤差が小さく、D = 1 の 1 - n/N のような境界値を正確に求められる）
+        larger = max(defect_count, sample_size)
+        pmf = 1.0
+        for i in range(terms):
+            pmf *= (population_size - larger - i) / (population_size - i)
+    else:
+        # C(D, k0) C(N - D, n - k0) / C(N, n)
+        lgamma = math.lgamma
+        pmf = math.exp(
+            lgamma(defect_count + 1) - lgamma(k_min + 1) - lgamma(defect_count - k_min + 1)
+            + lgamma(others + 1) - lgamma(sample_size - k_min + 1) - lgamma(others - sample_size + k_min + 1)
+            - (lgamma(population_size + 1) - lgamma(sample_size + 1) - lgamma(population_size - sample_size + 1))
+        )
 
+    total = pmf
+    for k in range(k_min + 1, c_value + 1):
+        pmf = pmf * ((defect_count - k + 1) * (sample_size - k + 1)) / (k * (others - sample_size + k))
+        total += pmf
+    return min(total, 1.0)
 
-@lru_cache(maxsize=512)
+
+@lru_cache(maxsize=4096)
 def _cached_hypergeom_cdf(c_value, population_size, defect_count, sample_size):
-    _, hypergeom = _ensure_scipy_distributions()
-    return hypergeom.cdf(c_value, population_size, defect_count, sample_size)
+    return _hypergeom_cdf(c_value, population_size, defect_count, sample_size)
+
+
+def _hypergeometric_probability(n, D, N, c):
+    """超幾何分布による確率計算"""
+    if D == 0:
+        return 1.0 if c == 0 else 0.0
+    # 例外処理に頼らず、分布が定義されない組み合わせは先に確率0とする
+    if n > N or D > N or c < 0 or c > min(n, D):
+        return 0.0
+
+    # 引数順序: (許容不良数, 母集団数, 不良数, 抜取数)
+    return _cached_hypergeom_cdf(c, N, D, n)
+
+
+def _acceptance_probability(n, defect_rate, c_value, lot_size):
+    """抜取数 n における合格確率（有限母集団補正を考慮）"""
+    # より厳密な判定基準：n/N > 0.1 または n > 50 の場合に超幾何分布を使用
+    if (n / lot_size > 0.1) or (n > 50):
+        # 超幾何分布での確率計算（期待不良数が0にならないよう調整）
+        defect_count = max(1, round(lot_size * defect_rate))
+        # 正しい引数順序: (抜取数, 不良数, 母集団数, 許容不良数)
+        return _hypergeometric_probability(n, defect_count, lot_size, c_value)
+    # 二項分布での確率計算
+    return _cached_binom_cdf(c_value, n, defect_rate)
+
+
+def _ltpd_sample_size_estimate(ltpd_p, beta_p, c_value):
+    """LTPD 条件 P(X <= c) <= β を満たす抜取数の推定値（探索の起点に使う、1 以上の整数）
+
+    c = 0 では二項分布の閉形式 log(β) / log(1 - LTPD)、それ以外はポアソン近似
+    P(Poisson(λ) <= c) = β となる λ = chdtri(2(c + 1), β) / 2 から λ / LTPD とする。
+    推定値は起点に使うだけで、探索結果には影響しない。
+    """
+    if not 0 < ltpd_p < 1 or not 0 < beta_p < 1:
+        return 1
+    if c_value == 0:
+        estimate = math.log(beta_p) / math.log1p(-ltpd_p)
+    else:
+        if _CHDTRI is None:
+            _load_scipy_special()
+        estimate = _CHDTRI(2 * (c_value + 1), beta_p) / (2 * ltpd_p)
+    if not math.isfinite(estimate) or estimate <= 1:
+        return 1
+    return min(math.ceil(estimate), 1 << 30)
+
+
+def _monotone_sample_size_segments(c_value, lot_size, upper):
+    """合格確率が抜取数 n について単調非増加となる区間 (下端, 上端) を n の小さい順に返す
+
+    _acceptance_probability は n <= 50 かつ n/N <= 0.1 では二項分布、それ以外では
+    超幾何分布を使うため、切り替わりの前後で合格確率が増えることがある。
+    また超幾何分布は c > min(n, D) を確率0とするため、n < c の範囲は別の区間とする。
+    各区間の中では、どちらの分布も n が増えるほど合格確率は増えない。
+    """
+    # n/N > 0.1 とならない最大の n は N // 10（n <= 50 と上限でも制限する）
+    binomial_end = min(50, upper, int(lot_size // 10))
+    segments = (
+        (1, binomial_end),
+        (binomial_end + 1, min(c_value - 1, upper)),
+        (max(binomial_end + 1, c_value), upper),
+    )
+    return tuple((low, high) for low, high in segments if low <= high)
+
+
+def _first_satisfying(predicate, low, high, guess):
+    """[low, high] で偽から真に切り替わる predicate が真となる最小の n（真にならなければ None）
+
+    guess から幅を倍々に広げて切り替わり位置を挟み込み、その範囲を二分探索する。
+    """
+    if not predicate(high):
+        return None
+    guess = min(max(guess, low), high)
+    step = 1
+    if predicate(guess):
+        high = guess
+        while high - step >= low and predicate(high - step):
+            high -= step
+            step *= 2
+        low = max(low, high - step + 1)
+    else:
+        low = guess + 1
+        while low + step - 1 < high and not predicate(low + step - 1):
+            low += step
+            step *= 2
+        high = min(high, low + step - 1)
+
+    while low < high:
+        mid = (low + high) // 2
+        if predicate(mid):
+            high = mid
+        else:
+            low = mid + 1
+    return high
+
+
+@lru_cache(maxsize=1024)
+def _search_min_sample_size(aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size):
+    """P(合格|AQL) >= 1 - α かつ P(合格|LTPD) <= β を満たす最小の抜取数（なければ None）
+
+    合格確率が単調非増加となる区間ごとに、LTPD 条件を満たす最小の n を探し、
+    その n が AQL 条件も満たせば解とする（区間内では n が大きいほど AQL 条件は
+    厳しくなるため、その区間に他の解はない）。1 から順に調べた場合と同じ結果になる。
+    入力だけで決まる純粋な計算のため、エンジンの作り直しをまたいで結果を共有する。
+    """
+    upper = min(lot_size, 10000)  # 実用的な上限を設定
+    accept_limit = 1 - alpha_p
+    guess = _ltpd_sample_size_estimate(ltpd_p, beta_p, c_value)
+
+    ltpd_probs = {}
+
+    def meets_ltpd(n):
+        # 起点の確認と二分探索で同じ n を再評価しないよう、探索中の結果を保持する
+        prob = ltpd_probs.get(n)
+        if prob is None:
+            prob = ltpd_probs[n] = _acceptance_probability(n, ltpd_p, c_value, lot_size)
+        return prob <= beta_p
+
+    for low, high in _monotone_sample_size_segments(c_value, lot_size, upper):
+        n = _first_satisfying(meets_ltpd, low, high, guess)
+        if n is not None and _acceptance_probability(n, aql_p, c_value, lot_size) >= accept_limit:
+            return n
+    return None
+
+
+@lru_cache(maxsize=256)
+def _oc_curve_points(n_sample, c_value, lot_size):
+    """OCカーブの (不良率[%], 合格確率[%]) の組を返す（n, c, N だけで決まるためキャッシュする）"""
+    use_hypergeometric = (n_sample / lot_size > 0.1) or (n_sample > 50)
+    if use_hypergeometric:  # 超幾何分布（不良数は切り捨て、境界の扱いは _hypergeometric_probability に従う）
+        probs = [
+            _hypergeometric_probability(n_sample, defect_count, lot_size, c_value)
+            for defect_count in (lot_size * _OC_DEFECT_RATES).astype(np.int64).tolist()
+        ]
+    elif c_value >= n_sample:  # 二項分布（c >= n は確率1）
+        probs = [1.0] * len(OC_DEFECT_RATE_POINTS)
+    else:
+        # 全不良率点の合格確率を配列でまとめて計算する
+        if _BDTR is None:
+            _load_scipy_special()
+        probs = _BDTR(c_value, n_sample, _OC_DEFECT_RATES).tolist()
+
+    return tuple(
+        (p_percent, prob * 100) for p_percent, prob in zip(OC_DEFECT_RATE_POINTS, probs)
+    )
+
+
+def _format_comment_value(value, percent=True):
+    if value is None:
+        return "-"
+    try:
+        numeric = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+    if percent:
+        formatted = f"{numeric:.2f}".rstrip('0').rstrip('.')
+        return formatted or "0"
+
+    if numeric.is_integer():
+        return str(int(numeric))
+    return f"{numeric:.2f}".rstrip('0').rstrip('.') or "0"
+
+
+@lru_cache(maxsize=64)
+def _cached_inspection_comment(aql, ltpd, alpha, beta, c_value, description):
+    """検査水準コメント文字列を生成（プリセットごとに同じ文字列となるためキャッシュする）"""
+    aql_str = _format_comment_value(aql)
+    ltpd_str = _format_comment_value(ltpd)
+    alpha_str = _format_comment_value(alpha)
+    beta_str = _format_comment_value(beta)
+    c_value_str = _format_comment_value(c_value, percent=False)
+
+    comment = (
+        f"\u6761\u4ef6: AQL={aql_str}%, LTPD={ltpd_str}%, "
+        f"\u03b1={alpha_str}%, \u03b2={beta_str}%, c={c_value_str}"
+    )
+
+    if description:
+        comment += f" | \u7528\u9014: {description}"
+
+    return comment
+
+
+@lru_cache(maxsize=128)
+def _cached_adjustment_info(original_aql, original_ltpd, adjusted_aql, adjusted_ltpd, historical_defect_rate):
+    """調整情報の文字列を生成（入力の5値だけで決まるためキャッシュする）"""
+    if original_aql == adjusted_aql and original_ltpd == adjusted_ltpd:
+        return None
+
+    # 調整理由と効果は実績不良率の区分ごとに固定の文言
+    if historical_defect_rate < 0.5:
+        reason = (
+            "調整理由: 実績不良率が低いため、効率的な検査基準に調整\n"
+            "効果: 検査コストの削減、実務運用の最適化\n"
+        )
+    elif historical_defect_rate > 1.0:
+        reason = (
+            "調整理由: 実績不良率が高いため、より厳しい検査基準を適用\n"
+            "効果: 品質維持の強化、不良品流出の防止\n"
+        )
+    else:
+        reason = (
+            "調整理由: 実績不良率に基づく微調整\n"
+            "効果: 統計的精度の向上\n"
+        )
+
+    return "".join((
+        "【データベース実績に基づくAQL/LTPD調整】\n\n",
+        f"実績不良率: {historical_defect_rate:.3f}%\n\n",
+        "元の設定:\n",
+        f"• AQL: {original_aql}% → {adjusted_aql}%\n",
+        f"• LTPD: {original_ltpd}% → {adjusted_ltpd}%\n\n",
+        reason,
+    ))
+
+
+def _summarize_defects(row):
+    """集計クエリの1行から数量・不良率・不具合項目の順位をまとめる"""
+    data = {'total_qty': 0, 'total_defect': 0, 'defect_rate': 0, 'defect_rates_sorted': [], 'best5': []}
+    if not row or row[0] is None:
+        return data
+
+    # row[0] は上で None でないことを確認済み
+    total_qty = row[0]
+    total_defect = row[1] if row[1] is not None else 0
+    data['total_qty'] = total_qty
+    data['total_defect'] = total_defect
+    if total_qty <= 0:
+        return data
+    data['defect_rate'] = total_defect / total_qty * 100
+
+    defect_counts = row[2:]
+    if defect_counts:
+        # 不具合項目ごとの集計値を配列化し、率の計算と並べ替えを NumPy でまとめて行う
+        counts = np.fromiter(
+            (count or 0 for count in defect_counts), dtype=np.int64, count=len(DEFECT_COLUMNS)
+        )
+        nonzero = np.flatnonzero(counts)
+        order = nonzero[np.argsort(-counts[nonzero], kind='stable')]
+        # 以降は不具合のあった項目だけを扱い、率もその分だけ計算する
+        ranked_counts = counts[order]
+        ranked_rates = ranked_counts * (100.0 / total_qty)
+        # 要素ごとの float()/int() 変換を避け、tolist() でまとめて Python の値に戻す
+        defect_rates = list(zip(
+            _DEFECT_COLUMN_ARRAY[order].tolist(), ranked_rates.tolist(), ranked_counts.tolist()
+        ))
+        data['defect_rates_sorted'] = defect_rates
+        data['best5'] = [(col, count) for col, _, count in defect_rates[:5]]
+    return data
+
+
+# 抜取数の計算結果（エンジンのインスタンス間で共有する LRU キャッシュ）
+# 代替案の一括計算では未計算の条件だけを探索し結果を書き戻すため、参照と登録を個別に行える OrderedDict で持つ
+_SAMPLE_SIZE_CACHE = OrderedDict()
+_SAMPLE_SIZE_CACHE_LOCK = threading.Lock()
+
+
+def _sample_size_cache_key(aql, ltpd, alpha, beta, c_value, lot_size):
+    return (
+        round(aql, 6),
+        round(ltpd, 6),
+        round(alpha, 6),
+        round(beta, 6),
+        int(c_value),
+        int(lot_size),
+    )
+
+
+def _lookup_sample_size(cache_key):
+    # 参照された結果は最近使ったものとして末尾に移す（LRU）
+    with _SAMPLE_SIZE_CACHE_LOCK:
+        cached_result = _SAMPLE_SIZE_CACHE.get(cache_key)
+        if cached_result is not None:
+            _SAMPLE_SIZE_CACHE.move_to_end(cache_key)
+    return cached_result
+
+
+def _store_sample_size(cache_key, result):
+    with _SAMPLE_SIZE_CACHE_LOCK:
+        _SAMPLE_SIZE_CACHE[cache_key] = result
+        _SAMPLE_SIZE_CACHE.move_to_end(cache_key)
+        if len(_SAMPLE_SIZE_CACHE) > SAMPLE_SIZE_CACHE_LIMIT:
+            _SAMPLE_SIZE_CACHE.popitem(last=False)
 
 
 class CalculationEngine:
@@ -117,7 +505,6 @@ class CalculationEngine:
     
     def __init__(self, db_manager):
         self.db_manager = db_manager
-        self._sample_size_cache = {}
     
     def build_sql_query(self, base_sql, inputs):
         """SQLクエリの構築"""
@@ -138,33 +525,15 @@ class CalculationEngine:
 
     def fetch_data(self, cursor, inputs):
         """データの取得"""
-        data = {'total_qty': 0, 'total_defect': 0, 'defect_rate': 0, 'defect_rates_sorted': [], 'best5': []}
-        sql, params = self.build_sql_query(_BASE_DEFECT_AGGREGATE_SQL, inputs)
-        row = cursor.execute(sql, *params).fetchone()
-        
-        if not row or row[0] is None: 
-            return data
-            
-        total_qty, total_defect = row[0] or 0, row[1] or 0
-        data['total_qty'] = total_qty
-        data['total_defect'] = total_defect
-        data['defect_rate'] = (total_defect / total_qty * 100) if total_qty > 0 else 0
-        
-        defect_counts = row[2:]
-        if total_qty > 0 and defect_counts:
-            totals = float(total_qty)
-            defect_rates = [
-                (col, (count or 0) / totals * 100.0, count or 0)
-                for col, count in zip(DEFECT_COLUMNS, defect_counts)
-                if (count or 0) > 0
-            ]
-            defect_rates.sort(key=lambda x: x[2], reverse=True)
-            data['defect_rates_sorted'] = defect_rates
-            data['best5'] = [(col, count) for col, _, count in defect_rates[:5]]
-        else:
-            data['defect_rates_sorted'] = []
-            data['best5'] = []
-        return data
+        start_date, end_date = inputs['start_date'], inputs['end_date']
+        sql = _DEFECT_AGGREGATE_SQL_VARIANTS[(bool(start_date), bool(end_date))]
+        params = [inputs['product_number']]
+        if start_date:
+            params.append(start_date)
+        if end_date:
+            params.append(end_date)
+        row = cursor.execute(sql, params).fetchone()
+        return _summarize_defects(row)
 
     def calculate_stats(self, db_data, inputs):
         """AQL/LTPD設計に基づく統計計算（データベース実績活用版）"""
@@ -219,14 +588,15 @@ class CalculationEngine:
 
         preset_details = None
         if mode_key and mode_key in INSPECTION_COMMENT_PRESETS:
-            preset_details = INSPECTION_COMMENT_PRESETS[mode_key].copy()
+            preset_details = INSPECTION_COMMENT_PRESETS[mode_key]
         elif mode_label and mode_label in INSPECTION_COMMENT_BY_LABEL:
-            preset_details = INSPECTION_COMMENT_BY_LABEL[mode_label].copy()
+            preset_details = INSPECTION_COMMENT_BY_LABEL[mode_label]
         elif mode_details:
-            preset_details = mode_details.copy()
+            preset_details = mode_details
 
+        # プリセットや入力値は共有オブジェクトのため、ラベルを補う場合のみ新しい辞書を作る
         if preset_details and mode_label and not preset_details.get('label'):
-            preset_details['label'] = mode_label
+            preset_details = {**preset_details, 'label': mode_label}
 
         active_mode_key = mode_key if mode_key in INSPECTION_COMMENT_PRESETS else None
 
@@ -241,13 +611,8 @@ class CalculationEngine:
                         active_mode_key = key
                         break
         else:
-            if aql <= 0.1:
-                fallback_key = "tightened"
-            elif aql <= 0.4:
-                fallback_key = "standard"
-            else:
-                fallback_key = "reduced"
-            preset_details = INSPECTION_COMMENT_PRESETS[fallback_key].copy()
+            fallback_key = _FALLBACK_MODE_KEYS[bisect_left(_FALLBACK_AQL_THRESHOLDS, aql)]
+            preset_details = INSPECTION_COMMENT_PRESETS[fallback_key]
             label = preset_details.get('label', "標準")
             level_text = label if label.endswith("検査") else f"{label}検査"
             level_reason = self._compose_inspection_comment(preset_details)
@@ -257,7 +622,7 @@ class CalculationEngine:
         results['level_reason'] = level_reason
         results['inspection_mode_label'] = preset_details.get('label', mode_label or "")
         results['inspection_mode_key'] = active_mode_key
-        results['inspection_mode_details'] = preset_details.copy() if preset_details else {}
+        results['inspection_mode_details'] = dict(preset_details) if preset_details else {}
         
         # AQL/LTPD設計による抜取数の計算（調整後）
         n_sample, warning_message = self._calculate_aql_ltpd_sample_size(
@@ -350,29 +715,24 @@ class CalculationEngine:
     
     def _calculate_aql_ltpd_sample_size(self, aql, ltpd, alpha, beta, c_value, lot_size):
         """AQL/LTPD設計による抜取数の計算（ロットサイズ考慮版）"""
-        cache_key = (
-            round(aql, 6),
-            round(ltpd, 6),
-            round(alpha, 6),
-            round(beta, 6),
-            int(c_value),
-            int(lot_size),
-        )
-        cached_result = self._sample_size_cache.get(cache_key)
+        cache_key = _sample_size_cache_key(aql, ltpd, alpha, beta, c_value, lot_size)
+        cached_result = _lookup_sample_size(cache_key)
         if cached_result is not None:
             return cached_result
 
         result = self._calculate_aql_ltpd_sample_size_core(
             aql, ltpd, alpha, beta, c_value, lot_size
         )
-
-        if len(self._sample_size_cache) >= SAMPLE_SIZE_CACHE_LIMIT:
-            oldest_key = next(iter(self._sample_size_cache), None)
-            if oldest_key is not None:
-                self._sample_size_cache.pop(oldest_key, None)
-        self._sample_size_cache[cache_key] = result
+        _store_sample_size(cache_key, result)
         return result
 
+    def _calculate_aql_ltpd_sample_sizes(self, designs, lot_size):
+        """複数の (AQL, LTPD, α, β, c) 条件の抜取数をまとめて計算（代替案用）
+
+        条件ごとに _calculate_aql_ltpd_sample_size を呼び、1条件ずつの計算と同じ探索・キャッシュを使う。
+        """
+        return [self._calculate_aql_ltpd_sample_size(*design, lot_size) for design in designs]
+
     def _calculate_aql_ltpd_sample_size_core(self, aql, ltpd, alpha, beta, c_value, lot_size):
         """AQL/LTPD設計による抜取数の計算（ロットサイズ考慮版）"""
         try:
@@ -382,19 +742,18 @@ class CalculationEngine:
             alpha_p = alpha / 100.0
             beta_p = beta / 100.0
 
-            # ロットサイズに基づく計算方法の選択
-            if lot_size <= 50:
-                # 小ロット: 全数検査または高割合抜取
-                return self._calculate_small_lot_sample_size(aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size)
-            elif lot_size <= 500:
-                # 中ロット: 有限母集団補正を重視
-                return self._calculate_medium_lot_sample_size(aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size)
-            else:
-                # 大ロット: 有限母集団補正適用
-                return self._calculate_large_lot_sample_size(aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size)
+            # 極小ロット（10個以下）は探索せず全数検査
+            if lot_size <= 10:
+                return lot_size, f"小ロット（{lot_size}個）のため全数検査を推奨"
+
+            # ロットサイズによらず有限母集団補正つきの探索を行い、ロットサイズ以上なら全数検査に置き換える
+            n_sample, warning = self._binary_search_sample_size_with_fpc(
+                aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size
+            )
+            return self._apply_lot_size_limit(n_sample, warning, lot_size)
 
         except (ValueError, OverflowError, ZeroDivisionError):
-            return "計算エラー", "AQL/LTPDの値が無効です。"
+            return _SAMPLE_SIZE_ERROR_RESULT
 
     def _calculate_zero_acceptance_sample_size(self, aql_p, ltpd_p, alpha_p, beta_p):
         """c=0 の場合の理論値（二項近似）を算出"""
@@ -402,87 +761,35 @@ class CalculationEngine:
             return 0
 
         # (1 - p)^n >= 1 - alpha -> n >= log(1 - alpha) / log(1 - p)
+        # 小さな p で桁落ちしないよう log(1 - x) は log1p(-x) で求める
         n_aql = 0
         if alpha_p < 1:
-            n_aql = math.log(1 - alpha_p) / math.log(1 - aql_p)
-        n_ltpd = math.log(beta_p) / math.log(1 - ltpd_p)
+            n_aql = math.log1p(-alpha_p) / math.log1p(-aql_p)
+        n_ltpd = math.log(beta_p) / math.log1p(-ltpd_p)
 
         n = max(n_aql, n_ltpd)
         if not math.isfinite(n) or n <= 0:
             return 0
         return math.ceil(n)
 
-    def _calculate_small_lot_sample_size(self, aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size):
-        """小ロット（50個以下）の抜取数計算"""
-        if lot_size <= 10:
-            return lot_size, f"小ロット（{lot_size}個）のため全数検査を推奨"
-
-        n_sample, warning = self._binary_search_sample_size_with_fpc(
-            aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size
-        )
-        if isinstance(n_sample, str):
-            return lot_size, warning or n_sample
-        if n_sample >= lot_size:
-            return lot_size, f"小ロット（{lot_size}個）のため全数検査を推奨"
-
-        return n_sample, warning
-
-    def _calculate_medium_lot_sample_size(self, aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size):
-        """中ロット（51-500個）の抜取数計算（有限母集団補正重視）"""
-        n_sample, warning = self._binary_search_sample_size_with_fpc(
-            aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size
-        )
-        if isinstance(n_sample, str):
-            return lot_size, warning or n_sample
-        if n_sample >= lot_size:
-            return lot_size, f"算出値（{n_sample}個）がロットサイズを超えるため全数検査"
-
-        return n_sample, warning
-
-    def _calculate_large_lot_sample_size(self, aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size):
-        """大ロット（501個以上）の抜取数計算（有限母集団補正適用）"""
-        n_sample, warning = self._binary_search_sample_size_with_fpc(
-            aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size
-        )
+    def _apply_lot_size_limit(self, n_sample, warning, lot_size):
+        """探索結果がロットサイズ以上となる場合に全数検査へ置き換える"""
         if isinstance(n_sample, str):
             return lot_size, warning or n_sample
         if n_sample >= lot_size:
+            if lot_size <= 50:
+                return lot_size, f"小ロット（{lot_size}個）のため全数検査を推奨"
             return lot_size, f"算出値（{n_sample}個）がロットサイズを超えるため全数検査"
 
         return n_sample, warning
 
     def _binary_search_sample_size_with_fpc(self, aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size):
         """二分探索による抜取数の計算（c>0の場合）"""
-        low, high = 1, min(lot_size, 10000)  # 実用的な上限を設定
-        best_n = None
-        
-        while low <= high:
-            mid = (low + high) // 2
-            
-            # 有限母集団補正を考慮した確率計算（改善版）
-            # より厳密な判定基準：n/N > 0.1 または n > 50 の場合に超幾何分布を使用
-            use_hypergeometric = (mid / lot_size > 0.1) or (mid > 50)
-            
-            if use_hypergeometric:
-                # 超幾何分布での確率計算（期待不良数が0にならないよう調整）
-                defect_count_aql = max(1, round(lot_size * aql_p))
-                defect_count_ltpd = max(1, round(lot_size * ltpd_p))
-                # 正しい引数順序: (抜取数, 不良数, 母集団数, 許容不良数)
-                paql = self._hypergeometric_probability(mid, defect_count_aql, lot_size, c_value)
-                pltpd = self._hypergeometric_probability(mid, defect_count_ltpd, lot_size, c_value)
-            else:
-                # 二項分布での確率計算
-                paql = _cached_binom_cdf(c_value, mid, aql_p)
-                pltpd = _cached_binom_cdf(c_value, mid, ltpd_p)
-            
-            # 条件チェック
-            # P(合格|AQL) >= 1 - α かつ P(合格|LTPD) <= β
-            if paql >= (1 - alpha_p) and pltpd <= beta_p:
-                best_n = mid
-                high = mid - 1
-            else:
-                low = mid + 1
-        
+        best_n = _search_min_sample_size(aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size)
+        return self._resolve_searched_sample_size(best_n, aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size)
+
+    def _resolve_searched_sample_size(self, best_n, aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size):
+        """探索結果を (抜取数, 警告) に変換（解なしの場合は近似値または全数検査）"""
         if best_n is None:
             if c_value == 0:
                 approx = self._calculate_zero_acceptance_sample_size(aql_p, ltpd_p, alpha_p, beta_p)
@@ -490,142 +797,89 @@ class CalculationEngine:
                     return max(c_value + 1, approx), None
             return lot_size, f"c={c_value}、AQL={aql_p*100:.2f}%、LTPD={ltpd_p*100:.2f}%の条件では全数検査を推奨します。"
         return best_n, None
-    
-    def _hypergeometric_probability(self, n, D, N, c):
-        """超幾何分布による確率計算"""
-        if D == 0:
-            return 1.0 if c == 0 else 0.0
-        if n > N or c > min(n, D):
-            return 0.0
-        
-        try:
-            # 正しいパラメータ順序: (k, M, n, N)
-            # k: 許容不良数, M: 母集団数, n: 不良数, N: 抜取数
-            return _cached_hypergeom_cdf(c, N, D, n)
-        except:
-            return 0.0
-    
+
     def _calculate_oc_curve(self, n_sample, c_value, lot_size):
         """OCカーブ（Operating Characteristic Curve）の計算"""
         if isinstance(n_sample, str) or n_sample <= 0:
             return []
         
-        oc_data = []
-        use_hypergeometric = (n_sample / lot_size > 0.1) or (n_sample > 50)
-        for p_percent in OC_DEFECT_RATE_POINTS:
-            p = p_percent / 100.0
-            
-            if use_hypergeometric:  # 超幾何分布
-                prob = self._hypergeometric_probability(n_sample, int(lot_size * p), lot_size, c_value)
-            else:  # 二項分布
-                prob = _cached_binom_cdf(c_value, n_sample, p)
-            
-            oc_data.append({
-                'defect_rate': p_percent,
-                'acceptance_probability': prob * 100
-            })
-        
-        return oc_data
+        # 計算結果は共有キャッシュから取り出し、呼び出し側が変更できるよう毎回新しい辞書で返す
+        return [
+            {'defect_rate': p_percent, 'acceptance_probability': probability}
+            for p_percent, probability in _oc_curve_points(n_sample, c_value, lot_size)
+        ]
     
     @staticmethod
     def _compose_inspection_comment(details):
         """検査水準コメント文字列を生成"""
-
-        def fmt(value, percent=True):
-            if value is None:
-                return "-"
-            try:
-                numeric = float(value)
-            except (TypeError, ValueError):
-                return str(value)
-
-            if percent:
-                formatted = f"{numeric:.2f}".rstrip('0').rstrip('.')
-                return formatted or "0"
-
-            if numeric.is_integer():
-                return str(int(numeric))
-            return f"{numeric:.2f}".rstrip('0').rstrip('.') or "0"
-
-        aql_str = fmt(details.get('aql'))
-        ltpd_str = fmt(details.get('ltpd'))
-        alpha_str = fmt(details.get('alpha'))
-        beta_str = fmt(details.get('beta'))
-        c_value_str = fmt(details.get('c_value'), percent=False)
-
-        comment = (
-            f"\u6761\u4ef6: AQL={aql_str}%, LTPD={ltpd_str}%, "
-            f"\u03b1={alpha_str}%, \u03b2={beta_str}%, c={c_value_str}"
+        args = (
+            details.get('aql'),
+            details.get('ltpd'),
+            details.get('alpha'),
+            details.get('beta'),
+            details.get('c_value'),
+            details.get('description'),
         )
-
-        description = details.get('description')
-        if description:
-            comment += f" | \u7528\u9014: {description}"
-
-        return comment
+        try:
+            return _cached_inspection_comment(*args)
+        except TypeError:
+            # ハッシュできない値が含まれる場合はキャッシュを使わずに生成する
+            return _cached_inspection_comment.__wrapped__(*args)
     
     def _binomial_probability(self, n, p, c):
         """二項分布による合格確率の計算"""
-        try:
-            if p == 0:
-                return 1.0  # 不良率が0%の場合は確実に合格
-            
-            # 二項分布の累積分布関数
-            return _cached_binom_cdf(c, n, p)
-        except:
+        if p == 0:
+            return 1.0  # 不良率が0%の場合は確実に合格
+        # 不良率が範囲外、または負の n・c は計算できないため不合格扱い
+        if not 0 < p <= 1 or n < 0 or c < 0:
             return 0.0
+
+        # 二項分布の累積分布関数
+        return _cached_binom_cdf(c, n, p)
     
     def _generate_n_gt_n_guidance(self, n_sample, lot_size, aql, ltpd, alpha, beta, c_value):
         """n>N警告のガイダンス生成"""
         if isinstance(n_sample, str) or n_sample > lot_size:
-            guidance = "【n>N警告：AQL/LTPDの見直し提案】\n\n"
-            guidance += f"現在の設定では抜取数（{n_sample if isinstance(n_sample, int) else '理論値'}個）がロットサイズ（{lot_size:,}個）を超えています。\n\n"
-            guidance += "【推奨される見直し案】\n\n"
+            parts = ["【n>N警告：AQL/LTPDの見直し提案】\n\n"]
+            append = parts.append
+            append(f"現在の設定では抜取数（{n_sample if isinstance(n_sample, int) else '理論値'}個）がロットサイズ（{lot_size:,}個）を超えています。\n\n")
+            append("【推奨される見直し案】\n\n")
             
-            # 案1: AQLを緩和
-            guidance += "1. AQLを緩和する（より良いロットを通しやすく）\n"
-            for new_aql in [0.4, 0.65, 1.0, 1.5]:
-                test_n, _ = self._calculate_aql_ltpd_sample_size(new_aql, ltpd, alpha, beta, c_value, lot_size)
-                if isinstance(test_n, int) and test_n <= lot_size:
-                    guidance += f"   • AQL={new_aql}% → 抜取数: {test_n:,}個\n"
-            guidance += "\n"
-            
-            # 案2: LTPDを厳しく
-            guidance += "2. LTPDを厳しくする（より悪いロットを止めやすく）\n"
-            for new_ltpd in [1.5, 2.0, 2.5, 3.0]:
-                test_n, _ = self._calculate_aql_ltpd_sample_size(aql, new_ltpd, alpha, beta, c_value, lot_size)
-                if isinstance(test_n, int) and test_n <= lot_size:
-                    guidance += f"   • LTPD={new_ltpd}% → 抜取数: {test_n:,}個\n"
-            guidance += "\n"
-            
-            # 案3: リスクを調整
-            guidance += "3. リスク（α/β）を調整する\n"
+            aql_options = [0.4, 0.65, 1.0, 1.5]
+            ltpd_options = [1.5, 2.0, 2.5, 3.0]
             risk_combinations = [
                 (10.0, 10.0, "α=10%, β=10%"),
                 (15.0, 10.0, "α=15%, β=10%"),
                 (10.0, 15.0, "α=10%, β=15%")
             ]
+            c_options = [1, 2, 3]
+
+            # 全案の条件を代替案と同じ _calculate_aql_ltpd_sample_sizes でまとめて計算する
+            designs = (
+                [(new_aql, ltpd, alpha, beta, c_value) for new_aql in aql_options]
+                + [(aql, new_ltpd, alpha, beta, c_value) for new_ltpd in ltpd_options]
+                + [(aql, ltpd, new_alpha, new_beta, c_value) for new_alpha, new_beta, _ in risk_combinations]
+                + [(aql, ltpd, alpha, beta, new_c) for new_c in c_options]
+            )
+            sample_sizes = iter(self._calculate_aql_ltpd_sample_sizes(designs, lot_size))
+
+            sections = (
+                ("1. AQLを緩和する（より良いロットを通しやすく）\n", [f"AQL={new_aql}%" for new_aql in aql_options]),
+                ("2. LTPDを厳しくする（より悪いロットを止めやすく）\n", [f"LTPD={new_ltpd}%" for new_ltpd in ltpd_options]),
+                ("3. リスク（α/β）を調整する\n", [label for _, _, label in risk_combinations]),
+                ("4. c値（許容不良数）を上げる\n", [f"c={new_c}" for new_c in c_options]),
+            )
+            for heading, labels in sections:
+                append(heading)
+                for label in labels:
+                    test_n, _ = next(sample_sizes)
+                    if isinstance(test_n, int) and test_n <= lot_size:
+                        append(f"   • {label} → 抜取数: {test_n:,}個\n")
+                append("\n")
             
-            for new_alpha, new_beta, label in risk_combinations:
-                test_n, _ = self._calculate_aql_ltpd_sample_size(aql, ltpd, new_alpha, new_beta, c_value, lot_size)
-                if isinstance(test_n, int) and test_n <= lot_size:
-                    guidance += f"   • {label} → 抜取数: {test_n:,}個\n"
-            guidance += "\n"
-            
-            # 案4: c値を上げる
-            guidance += "4. c値（許容不良数）を上げる\n"
-            for new_c in [1, 2, 3]:
-                test_n, _ = self._calculate_aql_ltpd_sample_size(aql, ltpd, alpha, beta, new_c, lot_size)
-                if isinstance(test_n, int) and test_n <= lot_size:
-                    guidance += f"   • c={new_c} → 抜取数: {test_n:,}個\n"
-            guidance += "\n"
-            
-            guidance += "【ISO 2859-1標準の推奨値】\n"
-            guidance += "• AQL=0.25%, LTPD=1.0%, α=5%, β=10%, c=0 → 抜取数≈230個\n"
-            guidance += "• 小ロット（<1000個）では全数検査も検討してください\n\n"
-            guidance += "※ 品質要求に応じて最適な条件を選択してください。"
+            append(_GUIDANCE_STANDARD_TEXT)
             
-            return guidance
+            return "".join(parts)
         else:
             return None
 
@@ -638,77 +892,48 @@ class CalculationEngine:
         current_beta = _coerce_numeric_input(inputs, 'beta', 10.0, float, 0.1, 100.0)
         current_c = _coerce_numeric_input(inputs, 'c_value', 0, int, 0)
         
-        alternatives = "【AQL/LTPD設計による代替案の提案】\n\n"
-        
-        # 案1: AQLを緩和する
-        alternatives += "1. AQLを緩和する場合（より良いロットを通しやすく）:\n"
-        for aql in [0.4, 0.65, 1.0, 1.5]:
-            n_sample, _ = self._calculate_aql_ltpd_sample_size(
-                aql, current_ltpd, current_alpha, current_beta, current_c, lot_size
-            )
-            if isinstance(n_sample, int):
-                alternatives += f"   AQL={aql}%: {n_sample:,}個\n"
-            else:
-                alternatives += f"   AQL={aql}%: {n_sample}\n"
-        alternatives += "\n"
-        
-        # 案2: LTPDを厳しくする
-        alternatives += "2. LTPDを厳しくする場合（より悪いロットを止めやすく）:\n"
-        for ltpd in [0.5, 0.8, 1.2, 1.5]:
-            n_sample, _ = self._calculate_aql_ltpd_sample_size(
-                current_aql, ltpd, current_alpha, current_beta, current_c, lot_size
-            )
-            if isinstance(n_sample, int):
-                alternatives += f"   LTPD={ltpd}%: {n_sample:,}個\n"
-            else:
-                alternatives += f"   LTPD={ltpd}%: {n_sample}\n"
-        alternatives += "\n"
+        parts = ["【AQL/LTPD設計による代替案の提案】\n\n"]
+        append = parts.append
         
-        # 案3: リスクを調整する
-        alternatives += "3. リスク（α/β）を調整する場合:\n"
+        aql_options = [0.4, 0.65, 1.0, 1.5]
+        ltpd_options = [0.5, 0.8, 1.2, 1.5]
         risk_combinations = [
             (10.0, 5.0, "α=10%, β=5%"),
             (5.0, 5.0, "α=5%, β=5%"),
             (10.0, 10.0, "α=10%, β=10%"),
             (15.0, 10.0, "α=15%, β=10%")
         ]
+        c_options = [1, 2, 3]
+
+        # 全案の条件をまとめて計算する（条件ごとの探索結果はキャッシュを共有する）
+        designs = (
+            [(aql, current_ltpd, current_alpha, current_beta, current_c) for aql in aql_options]
+            + [(current_aql, ltpd, current_alpha, current_beta, current_c) for ltpd in ltpd_options]
+            + [(current_aql, current_ltpd, alpha, beta, current_c) for alpha, beta, _ in risk_combinations]
+            + [(current_aql, current_ltpd, current_alpha, current_beta, c_val) for c_val in c_options]
+        )
+        sample_sizes = iter(self._calculate_aql_ltpd_sample_sizes(designs, lot_size))
+
+        sections = (
+            ("1. AQLを緩和する場合（より良いロットを通しやすく）:\n", [f"AQL={aql}%" for aql in aql_options]),
+            ("2. LTPDを厳しくする場合（より悪いロットを止めやすく）:\n", [f"LTPD={ltpd}%" for ltpd in ltpd_options]),
+            ("3. リスク（α/β）を調整する場合:\n", [label for _, _, label in risk_combinations]),
+            ("4. c値（許容不良数）を上げる場合:\n", [f"c={c_val}" for c_val in c_options]),
+        )
+        for heading, labels in sections:
+            append(heading)
+            for label in labels:
+                result = next(sample_sizes)
+                if result is _SAMPLE_SIZE_ERROR_RESULT:
+                    append(f"   {label}: {result[0]}\n")
+                else:
+                    append(f"   {label}: {result[0]:,}個\n")
+            append("\n")
         
-        for alpha, beta, label in risk_combinations:
-            n_sample, _ = self._calculate_aql_ltpd_sample_size(
-                current_aql, current_ltpd, alpha, beta, current_c, lot_size
-            )
-            if isinstance(n_sample, int):
-                alternatives += f"   {label}: {n_sample:,}個\n"
-            else:
-                alternatives += f"   {label}: {n_sample}\n"
-        alternatives += "\n"
-        
-        # 案4: c値を上げる
-        alternatives += "4. c値（許容不良数）を上げる場合:\n"
-        for c_val in [1, 2, 3]:
-            n_sample, _ = self._calculate_aql_ltpd_sample_size(
-                current_aql, current_ltpd, current_alpha, current_beta, c_val, lot_size
-            )
-            if isinstance(n_sample, int):
-                alternatives += f"   c={c_val}: {n_sample:,}個\n"
-            else:
-                alternatives += f"   c={c_val}: {n_sample}\n"
-        alternatives += "\n"
-        
-        # 推奨案
-        alternatives += "【推奨案】\n"
-        alternatives += "現在の条件では統計的に適切な抜取検査が困難です。\n"
-        alternatives += "以下のいずれかを検討してください:\n\n"
-        alternatives += "• AQLを0.4%以上に緩和する\n"
-        alternatives += "• LTPDを1.5%以上に設定する\n"
-        alternatives += "• α（生産者危険）を10%以上に設定する\n"
-        alternatives += "• c値を1以上に設定する\n"
-        alternatives += "• 全数検査の実施\n\n"
-        alternatives += "※ ISO 2859-1標準に基づく推奨値:\n"
-        alternatives += "   AQL=0.25%, LTPD=1.0%, α=5%, β=10%, c=0 → n≈230\n"
-        alternatives += "※ 品質要求に応じて最適な条件を選択してください。"
+        # 推奨案（固定文）
+        append(_ALTERNATIVES_RECOMMENDATION_TEXT)
         
-        return alternatives
+        return "".join(parts)
     
     def _adjust_aql_ltpd_based_on_history(self, original_aql, original_ltpd, historical_defect_rate, total_quantity):
         """データベース実績に基づくAQL/LTPD調整（統計学的に改善された実装）"""
@@ -718,22 +943,8 @@ class CalculationEngine:
         rate = historical_defect_rate
         
         # 統計学的に根拠のある調整係数の計算
-        # 実績不良率と目標AQLの関係に基づく連続的な調整
-        if rate <= 0.1:
-            # 非常に低い不良率: 軽微な厳格化
-            adjustment_factor = 1.05
-        elif rate <= 0.5:
-            # 低い不良率: 微調整
-            adjustment_factor = 1.02
-        elif rate <= 1.0:
-            # 標準的な不良率: 調整なし
-            adjustment_factor = 1.0
-        elif rate <= 2.0:
-            # やや高い不良率: 軽微な緩和
-            adjustment_factor = 0.95
-        else:
-            # 高い不良率: 適度な緩和
-            adjustment_factor = 0.90
+        # 実績不良率と目標AQLの関係に基づく連続的な調整（区分は _HISTORY_RATE_THRESHOLDS を参照）
+        adjustment_factor = _HISTORY_ADJUSTMENT_FACTORS[bisect_left(_HISTORY_RATE_THRESHOLDS, rate)]
 
         # 信頼度に基づく調整の適用
         confidence_factor = max(0.0, min(1.0, total_quantity / 1000.0))
@@ -750,26 +961,10 @@ class CalculationEngine:
 
         return round(adjusted_aql, 3), round(adjusted_ltpd, 3)
 
-    def _generate_adjustment_info(self, original_aql, original_ltpd, adjusted_aql, adjusted_ltpd, historical_defect_rate):
+    @staticmethod
+    def _generate_adjustment_info(original_aql, original_ltpd, adjusted_aql, adjusted_ltpd, historical_defect_rate):
         """調整情報の生成"""
-        if original_aql == adjusted_aql and original_ltpd == adjusted_ltpd:
-            return None
-        
-        info = "【データベース実績に基づくAQL/LTPD調整】\n\n"
-        info += f"実績不良率: {historical_defect_rate:.3f}%\n\n"
-        info += f"元の設定:\n"
-        info += f"• AQL: {original_aql}% → {adjusted_aql}%\n"
-        info += f"• LTPD: {original_ltpd}% → {adjusted_ltpd}%\n\n"
-        
-        if historical_defect_rate < 0.5:
-            info += "調整理由: 実績不良率が低いため、効率的な検査基準に調整\n"
-            info += "効果: 検査コストの削減、実務運用の最適化\n"
-        elif historical_defect_rate > 1.0:
-            info += "調整理由: 実績不良率が高いため、より厳しい検査基準を適用\n"
-            info += "効果: 品質維持の強化、不良品流出の防止\n"
-        else:
-            info += "調整理由: 実績不良率に基づく微調整\n"
-            info += "効果: 統計的精度の向上\n"
-        
-        return info
+        return _cached_adjustment_info(
+            original_aql, original_ltpd, adjusted_aql, adjusted_ltpd, historical_defect_rate
+        )
 
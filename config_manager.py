@@ -6,40 +6,76 @@
 import os
 import sys
 import json
-from copy import deepcopy
-from tkinter import filedialog, messagebox
+import atexit
+import threading
+from types import MappingProxyType
 
 from security_manager import SecurityManager
 
+try:
+    import orjson
+except ImportError:  # orjson が無い環境では標準の json で読み書きする
+    orjson = None
 
-# 検査区分の定義
-INSPECTION_MODE_META = {
-    "tightened": {
+
+# 検査区分の定義（読み取り専用。参照側は複製せずにそのまま共有してよい）
+INSPECTION_MODE_META = MappingProxyType({
+    "tightened": MappingProxyType({
         "label": "強化",
         "description": "初期流動・不具合再発時"
-    },
-    "standard": {
+    }),
+    "standard": MappingProxyType({
         "label": "標準",
         "description": "通常ロット"
-    },
-    "reduced": {
+    }),
+    "reduced": MappingProxyType({
         "label": "緩和",
         "description": "安定生産・顧客信頼製品"
-    }
-}
+    })
+})
+
+def _read_json_file(path):
+    """JSONファイルを読み込む（orjson があればバイト列のまま解析する）"""
+    if orjson is not None:
+        with open(path, "rb") as handle:
+            data = handle.read()
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson は NaN / Infinity を受け付けないため、標準の json で読めていたファイルは json で読み直す
+            return json.loads(data.decode("utf-8"))
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+# 表示名 → 検査区分キー、検査区分キー → 表示名（いずれも INSPECTION_MODE_META から一度だけ作る）
+_LABEL_TO_KEY = {meta["label"]: key for key, meta in INSPECTION_MODE_META.items()}
+_MODE_CHOICES = MappingProxyType({key: meta["label"] for key, meta in INSPECTION_MODE_META.items()})
+
+# 検査区分ごとに保持する条件値の名前（設定ファイルのキーと同じ順）
+_PARAMS = ("aql", "ltpd", "alpha", "beta", "c_value")
+# 条件値の名前 → 旧形式の default_* キー
+_LEGACY_KEYS = MappingProxyType({param: f"default_{param}" for param in _PARAMS})
+
+# 各検査区分のデフォルト値（読み取り専用。設定へ書き込む際は _copy_presets で辞書に戻す）
+DEFAULT_PRESETS = MappingProxyType({
+    "tightened": MappingProxyType({"aql": 0.10, "ltpd": 0.50, "alpha": 3.0, "beta": 5.0, "c_value": 0}),
+    "standard": MappingProxyType({"aql": 0.25, "ltpd": 1.0, "alpha": 5.0, "beta": 10.0, "c_value": 0}),
+    "reduced": MappingProxyType({"aql": 0.40, "ltpd": 1.5, "alpha": 10.0, "beta": 15.0, "c_value": 0})
+})
 
-# 各検査区分のデフォルト値
-DEFAULT_PRESETS = {
-    "tightened": {"aql": 0.10, "ltpd": 0.50, "alpha": 3.0, "beta": 5.0, "c_value": 0},
-    "standard": {"aql": 0.25, "ltpd": 1.0, "alpha": 5.0, "beta": 10.0, "c_value": 0},
-    "reduced": {"aql": 0.40, "ltpd": 1.5, "alpha": 10.0, "beta": 15.0, "c_value": 0}
-}
+
+def _copy_presets(presets):
+    """検査区分ごとのプリセットを複製（値は不変のスカラーのみのため、2段目の辞書を作り直せば十分）"""
+    return {mode: dict(values) for mode, values in presets.items()}
 
 
 class ConfigManager:
     """設定管理クラス"""
 
     CONFIG_FILE = "app_config.json"
+    # 連続した設定変更をまとめて1回の書き込みにするまでの待ち時間（秒）
+    SAVE_DELAY_SECONDS = 0.1
     
     def _get_config_file_path(self):
         """設定ファイルのパス取得（PyInstaller対応）"""
@@ -61,7 +97,8 @@ class ConfigManager:
             # 開発環境の場合
             return 'app_config.json'
 
-    DEFAULT_CONFIG = {
+    # 既定の設定値（読み取り専用。実際の設定は _fresh_default_config で辞書として作る）
+    DEFAULT_CONFIG = MappingProxyType({
         "database_path": "不良情報記録.accdb",
         "window_geometry": "1000x700",
         "last_product_number": "",
@@ -71,11 +108,20 @@ class ConfigManager:
         "default_beta": 10.0,
         "default_c_value": 0,
         "inspection_mode": "standard",
-        "inspection_presets": deepcopy(DEFAULT_PRESETS)
-    }
+        "inspection_presets": DEFAULT_PRESETS
+    })
 
     def __init__(self):
         self.security_manager = SecurityManager()
+        # get_database_path の結果 ((設定値, 作業ディレクトリ), パス)
+        self._database_path_cache = None
+        # 保存されていない変更があるか（起動時の正規化は保存対象にしない）
+        self._dirty = False
+        # 遅延保存用のタイマーと、設定の変更・書き込みを直列化するロック
+        self._save_timer = None
+        self._save_lock = threading.RLock()
+        # 終了時に保留中の変更を書き出す
+        atexit.register(self.flush)
         self.config = self._load_config()
         # アプリ起動時は毎回標準検査に設定（検査区分の設定値は保持）
         self.config["inspection_mode"] = "standard"
@@ -94,34 +140,38 @@ class ConfigManager:
             embedded_config_path = self._get_config_file_path()
             user_config_path = self._get_user_config_path()
             
-            # 埋め込まれた設定ファイルを読み込み
-            if os.path.exists(embedded_config_path):
-                with open(embedded_config_path, "r", encoding="utf-8") as handle:
-                    loaded = json.load(handle)
-            else:
+            # 埋め込まれた設定ファイルを読み込み（存在確認と読み込みを分けず、無ければ例外で判定する）
+            try:
+                loaded = _read_json_file(embedded_config_path)
+            except FileNotFoundError:
                 # 埋め込まれたファイルがない場合はデフォルト設定を使用
-                loaded = deepcopy(self.DEFAULT_CONFIG)
+                loaded = self._fresh_default_config()
             
             # ユーザー設定ファイルが存在する場合は上書き
-            if os.path.exists(user_config_path):
-                with open(user_config_path, "r", encoding="utf-8") as handle:
-                    user_loaded = json.load(handle)
+            # （開発環境では埋め込み設定と同じファイルのため、読み直さない）
+            user_loaded = None
+            if user_config_path != embedded_config_path:
+                try:
+                    user_loaded = _read_json_file(user_config_path)
+                except FileNotFoundError:
+                    pass
+            if user_loaded is not None:
                 # ユーザー設定で上書き
                 for key, value in user_loaded.items():
                     if key != "inspection_presets":
                         loaded[key] = value
 
-            merged = deepcopy(self.DEFAULT_CONFIG)
+            merged = self._fresh_default_config()
             for key, value in loaded.items():
                 if key == "inspection_presets":
                     continue
                 merged[key] = value
 
-                presets = deepcopy(self.DEFAULT_CONFIG["inspection_presets"])
+                presets = _copy_presets(self.DEFAULT_CONFIG["inspection_presets"])
                 user_presets = loaded.get("inspection_presets", {})
                 for mode_key in INSPECTION_MODE_META.keys():
                     if mode_key in user_presets and isinstance(user_presets[mode_key], dict):
-                        for param in ["aql", "ltpd", "alpha", "beta", "c_value"]:
+                        for param in _PARAMS:
                             if param in user_presets[mode_key]:
                                 try:
                                     value = float(user_presets[mode_key][param])
@@ -158,25 +208,74 @@ class ConfigManager:
                 )
                 return merged
 
-            defaults = deepcopy(self.DEFAULT_CONFIG)
+            defaults = self._fresh_default_config()
             defaults["inspection_mode"] = self._normalize_mode_key(defaults["inspection_mode"])
             return defaults
         except Exception as exc:
             print(f"設定ファイルの読み込みエラー: {exc}")
-            defaults = deepcopy(self.DEFAULT_CONFIG)
+            defaults = self._fresh_default_config()
             defaults["inspection_mode"] = self._normalize_mode_key(defaults["inspection_mode"])
             return defaults
 
-    def save_config(self):
-        """設定ファイルの保存"""
-        try:
-            user_config_path = self._get_user_config_path()
-            with open(user_config_path, "w", encoding="utf-8") as handle:
-                json.dump(self.config, handle, ensure_ascii=False, indent=2)
-            return True
-        except Exception as exc:
-            print(f"設定ファイルの保存エラー: {exc}")
-            return False
+    def save_config(self, durable=True):
+        """設定ファイルの保存
+
+        一時ファイルに書き出してから置き換えるため、書き込み途中の内容が残らない。
+        durable が真の場合はディスクへの反映（fsync）まで待つ。
+        """
+        with self._save_lock:
+            try:
+                user_config_path = self._get_user_config_path()
+                temp_path = user_config_path + ".tmp"
+                if orjson is not None:
+                    # json.dump(ensure_ascii=False, indent=2) と同じ体裁の UTF-8 バイト列を作る
+                    # （文字列以外のキーも json.dump と同様に文字列化して書き出す）
+                    data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                else:
+                    data = json.dumps(self.config, ensure_ascii=False, indent=2).encode("utf-8")
+                # 先に全体をバイト列にしておき、一時ファイルへは1回で書き込む
+                with open(temp_path, "wb") as handle:
+                    handle.write(data)
+                    if durable:
+                        handle.flush()
+                        os.fsync(handle.fileno())
+                os.replace(temp_path, user_config_path)
+                self._dirty = False
+                return True
+            except Exception as exc:
+                print(f"設定ファイルの保存エラー: {exc}")
+                return False
+
+    def _flush_if_dirty(self, durable=False):
+        """未保存の変更がある場合だけ設定ファイルへ書き込む"""
+        with self._save_lock:
+            if not self._dirty:
+                return True
+            return self.save_config(durable=durable)
+
+    def _schedule_save(self):
+        """変更を記録し、少し待ってからまとめて保存する（待機中の保存は取り消して予約し直す）"""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.SAVE_DELAY_SECONDS, self._flush_if_dirty)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """保留中の保存を取り消し、未保存の変更があれば直ちに書き込む"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            return self._flush_if_dirty(durable=True)
+
+    def _fresh_default_config(self):
+        """デフォルト設定の新しい辞書（値はすべて不変のスカラーのため、入れ子の辞書だけ作り直す）"""
+        config = dict(self.DEFAULT_CONFIG)
+        config["inspection_presets"] = _copy_presets(self.DEFAULT_CONFIG["inspection_presets"])
+        return config
 
     # ------------------------------------------------------------------
     # データベースパス関連
@@ -185,6 +284,12 @@ class ConfigManager:
         """データベースパスの取得"""
         db_path = self.config.get("database_path", self.DEFAULT_CONFIG["database_path"])
 
+        # 復号・サニタイズの結果は設定値（と相対パス解決に使う作業ディレクトリ）が同じ間は再利用する
+        cache_key = (db_path, os.getcwd())
+        cached = self._database_path_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
         if db_path.startswith("encrypted:"):
             try:
                 encrypted_data = db_path[10:]
@@ -199,8 +304,9 @@ class ConfigManager:
             return self.DEFAULT_CONFIG["database_path"]
 
         if not os.path.isabs(sanitized_path):
-            sanitized_path = os.path.join(os.getcwd(), sanitized_path)
+            sanitized_path = os.path.join(cache_key[1], sanitized_path)
 
+        self._database_path_cache = (cache_key, sanitized_path)
         return sanitized_path
 
     def set_database_path(self, path):
@@ -211,6 +317,8 @@ class ConfigManager:
                 "INVALID_DB_PATH",
                 f"無効なDBパス: {path} - {message}"
             )
+            # tkinter はダイアログを出すときだけ読み込む（設定の読み書きだけなら不要）
+            from tkinter import messagebox
             messagebox.showerror("セキュリティエラー", f"データベースパスが無効です: {message}")
             return False
 
@@ -229,6 +337,8 @@ class ConfigManager:
 
     def select_database_file(self, parent_window=None):
         """データベースファイルの参照"""
+        from tkinter import filedialog, messagebox
+
         try:
             current_path = self.get_database_path()
             initial_dir = os.path.dirname(current_path) if os.path.dirname(current_path) else os.getcwd()
@@ -270,13 +380,16 @@ class ConfigManager:
         return self.config.get(key, default)
 
     def set(self, key, value):
-        """設定値の設定"""
-        self.config[key] = value
-        self.save_config()
+        """設定値の設定（値が変わらない場合は書き込まない）"""
+        with self._save_lock:
+            if key in self.config and self.config[key] == value:
+                return
+            self.config[key] = value
+            self._schedule_save()
 
     def reset_to_defaults(self):
         """設定をデフォルトにリセット"""
-        self.config = deepcopy(self.DEFAULT_CONFIG)
+        self.config = self._fresh_default_config()
         self.config["inspection_mode"] = self._normalize_mode_key(self.config["inspection_mode"])
         self.save_config()
 
@@ -293,16 +406,17 @@ class ConfigManager:
         return INSPECTION_MODE_META[key]["label"]
 
     def get_inspection_mode_choices(self):
-        """検査区分選択肢を取得 (key -> label)"""
-        return {key: meta["label"] for key, meta in INSPECTION_MODE_META.items()}
+        """検査区分選択肢を取得 (key -> label、読み取り専用)"""
+        return _MODE_CHOICES
 
     def get_inspection_mode_details(self, mode_key=None):
         """検査区分の詳細情報を取得"""
         key = self._normalize_mode_key(mode_key or self.get_inspection_mode())
-        details = deepcopy(INSPECTION_MODE_META[key])
-        preset = deepcopy(self.config.get("inspection_presets", {}).get(key, {}))
+        details = dict(INSPECTION_MODE_META[key])
+        # preset は参照するだけなので複製しない
+        preset = self.config.get("inspection_presets", {}).get(key, {})
         defaults = DEFAULT_PRESETS.get(key, {})
-        for param in ["aql", "ltpd", "alpha", "beta", "c_value"]:
+        for param in _PARAMS:
             details[param] = preset.get(param, defaults.get(param))
         return details
 
@@ -311,26 +425,33 @@ class ConfigManager:
         normalized_key = self._normalize_mode_key(mode_key)
 
         if persist:
-            self.config["inspection_mode"] = normalized_key
-            self._sync_legacy_defaults(normalized_key)
-            self.save_config()
+            with self._save_lock:
+                self.config["inspection_mode"] = normalized_key
+                self._sync_legacy_defaults(normalized_key)
+                self._schedule_save()
 
         return self.get_inspection_mode_details(normalized_key)
 
     def set_inspection_preset(self, mode_key, *, aql, ltpd, alpha, beta, c_value):
         """検査区分ごとのプリセット値を更新"""
         normalized_key = self._normalize_mode_key(mode_key)
-        presets = self.config.setdefault("inspection_presets", deepcopy(DEFAULT_PRESETS))
-        presets[normalized_key] = {
+        preset = {
             "aql": float(aql),
             "ltpd": float(ltpd),
             "alpha": float(alpha),
             "beta": float(beta),
             "c_value": int(c_value)
         }
-        if normalized_key == self.get_inspection_mode():
-            self._sync_legacy_defaults(normalized_key)
-        self.save_config()
+        with self._save_lock:
+            presets = self.config.setdefault("inspection_presets", _copy_presets(DEFAULT_PRESETS))
+            if presets.get(normalized_key) == preset:
+                # 値が変わらない場合は書き込まない
+                return
+            presets[normalized_key] = preset
+            if normalized_key == self.get_inspection_mode():
+                self._sync_legacy_defaults(normalized_key)
+            # 設定画面では検査区分ごとに続けて呼ばれるため、書き込みは1回にまとめる
+            self._schedule_save()
 
     # ------------------------------------------------------------------
     # 内部ユーティリティ
@@ -341,9 +462,7 @@ class ConfigManager:
             return mode_key
 
         if isinstance(mode_key, str):
-            for key, meta in INSPECTION_MODE_META.items():
-                if meta["label"] == mode_key:
-                    return key
+            return _LABEL_TO_KEY.get(mode_key, "standard")
 
         return "standard"
 
@@ -356,13 +475,13 @@ class ConfigManager:
         standard_details = DEFAULT_PRESETS.get("standard", {})
 
         # default_*項目を標準検査の値に更新
-        for param in ["aql", "ltpd", "alpha", "beta", "c_value"]:
-            legacy_key = f"default_{param if param != 'c_value' else 'c_value'}"
+        for param in _PARAMS:
+            legacy_key = _LEGACY_KEYS[param]
             if legacy_key in self.config:
                 self.config[legacy_key] = standard_details.get(param)
 
         # 各検査区分の設定値を常にデフォルト値に固定
-        self.config["inspection_presets"] = deepcopy(DEFAULT_PRESETS)
+        self.config["inspection_presets"] = _copy_presets(DEFAULT_PRESETS)
 
     def _sync_legacy_defaults(self, mode_key=None):
         """旧default_*項目を現在の検査区分パラメータに合わせる（検査区分の設定値は保持）"""
@@ -376,14 +495,14 @@ class ConfigManager:
             details = DEFAULT_PRESETS.get(active_key, DEFAULT_PRESETS.get("standard", {}))
 
         # 検査区分の設定値は上書きせず、default_*項目のみ更新
-        for param in ["aql", "ltpd", "alpha", "beta", "c_value"]:
-            legacy_key = f"default_{param if param != 'c_value' else 'c_value'}"
+        for param in _PARAMS:
+            legacy_key = _LEGACY_KEYS[param]
             if legacy_key in self.config:
                 self.config[legacy_key] = details.get(param)
 
         # inspection_presetsが存在しない場合のみデフォルト値を設定
         if "inspection_presets" not in self.config:
-            self.config["inspection_presets"] = deepcopy(DEFAULT_PRESETS)
+            self.config["inspection_presets"] = _copy_presets(DEFAULT_PRESETS)
         else:
             # 既存のinspection_presetsの各検査区分の設定値は保持し、不足分のみデフォルト値を補完
             for mode, default_values in DEFAULT_PRESETS.items():
@@ -3,7 +3,9 @@
 検査水準と計算関連の定数を定義
 """
 
+from bisect import bisect_left
 from datetime import datetime
+from types import MappingProxyType
 
 
 class InspectionConstants:
@@ -13,24 +15,29 @@ class InspectionConstants:
     DEFECT_RATE_THRESHOLD_NORMAL = 0.5  # 普通水準の閾値
     DEFECT_RATE_THRESHOLD_STRICT = 0.5  # きつい水準の閾値
     
-    # 検査水準の定義（簡素化版）
-    INSPECTION_LEVELS = {
-        'loose': {
+    # 検査水準の定義（簡素化版、読み取り専用）
+    INSPECTION_LEVELS = MappingProxyType({
+        'loose': MappingProxyType({
             'threshold': 0, 
             'name': '緩和検査', 
             'description': 'AQL値に基づく緩和された統計的設計'
-        },
-        'normal': {
+        }),
+        'normal': MappingProxyType({
             'threshold': 0.5, 
             'name': '標準検査', 
             'description': 'AQL値に基づく標準的な統計的設計'
-        },
-        'strict': {
+        }),
+        'strict': MappingProxyType({
             'threshold': float('inf'), 
             'name': '厳格検査', 
             'description': 'AQL値に基づく厳格な統計的設計'
-        }
-    }
+        })
+    })
+    
+    # get_inspection_level の区分（不具合率 <= 閾値 となる最初の区分の水準を使う）
+    # 0 → 緩和、0.5 以下 → 標準、それ以上 → 厳格
+    _LEVEL_THRESHOLDS = (0, DEFECT_RATE_THRESHOLD_NORMAL)
+    _LEVELS = (INSPECTION_LEVELS['loose'], INSPECTION_LEVELS['normal'], INSPECTION_LEVELS['strict'])
     
     # 計算制限値
     MAX_LOT_SIZE = 1000000  # 最大ロットサイズ
@@ -55,16 +62,17 @@ class InspectionConstants:
     @staticmethod
     def get_inspection_level(defect_rate):
         """不具合率に基づいて検査水準を取得"""
-        if defect_rate == 0:
-            return InspectionConstants.INSPECTION_LEVELS['loose']
-        elif defect_rate <= InspectionConstants.DEFECT_RATE_THRESHOLD_NORMAL:
-            return InspectionConstants.INSPECTION_LEVELS['normal']
-        else:
-            return InspectionConstants.INSPECTION_LEVELS['strict']
+        if not defect_rate >= 0:
+            # 従来の if 文と同じ結果にする（負の値は標準、NaN はどの比較も成り立たないため厳格）
+            level = 'normal' if defect_rate < 0 else 'strict'
+            return InspectionConstants.INSPECTION_LEVELS[level]
+        return InspectionConstants._LEVELS[
+            bisect_left(InspectionConstants._LEVEL_THRESHOLDS, defect_rate)
+        ]
 
 
-# 不具合項目の定義
-DEFECT_COLUMNS = [
+# 不具合項目の定義（並び順は集計結果の列順を兼ねるため変更不可）
+DEFECT_COLUMNS = (
     "外観キズ", "圧痕", "切粉", "毟れ", "穴大", "穴小", "穴キズ", "バリ", "短寸", "面粗", "サビ", "ボケ", "挽目", "汚れ", "メッキ", "落下",
     "フクレ", "ツブレ", "ボッチ", "段差", "バレル石", "径プラス", "径マイナス", "ゲージ", "異物混入", "形状不良", "こすれ", "変色シミ", "材料キズ", "ゴミ", "その他"
-]
\ No newline at end of file
+)
\ No newline at end of file
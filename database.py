@@ -7,7 +7,8 @@ import pyodbc
 import os
 import threading
 import time
-from queue import Queue, Empty
+from collections import deque
+from operator import itemgetter
 from typing import Optional
 from security_manager import SecurityManager
 from error_handler import error_handler, ErrorCode
@@ -20,56 +21,86 @@ class ConnectionPool:
     def __init__(self, connection_string: str, max_connections: int = 5):
         self.connection_string = connection_string
         self.max_connections = max_connections
-        self._pool = Queue(maxsize=max_connections)
+        # 返却された (接続, 最後に返却された時刻)。直近に返却されたものから使う
+        self._pool = deque()
         self._active_connections = 0
         self._lock = threading.Lock()
-        self._last_health_check = 0
-        self._health_check_interval = 300  # 5分間隔
+        # 空き接続の返却・接続数の減少を待つための条件変数（_lock を共有）
+        self._available = threading.Condition(self._lock)
+        self._wait_timeout = 30  # 空きを待つ最大秒数
+        self._idle_check_seconds = 60  # これより長く使われていない接続だけ有効性を確認する
     
     def get_connection(self) -> Optional[pyodbc.Connection]:
         """接続プールから接続を取得"""
         try:
-            # ヘルスチェックの実行
-            self._perform_health_check()
-            
-            # プールから接続を取得
-            try:
-                conn = self._pool.get_nowait()
-                if self._is_connection_valid(conn):
-                    return conn
-                else:
-                    conn.close()
-            except Empty:
-                pass
-            
-            # 新しい接続を作成
-            with self._lock:
-                if self._active_connections < self.max_connections:
-                    conn = pyodbc.connect(self.connection_string)
-                    self._active_connections += 1
+            deadline = None
+            while True:
+                with self._available:
+                    if self._pool:
+                        conn, last_used = self._pool.pop()
+                    elif self._active_connections < self.max_connections:
+                        # 接続数の枠だけ先に確保し、時間のかかる接続処理はロックの外で行う
+                        self._active_connections += 1
+                        conn = None
+                    else:
+                        # プールが満杯の場合は待機
+                        if deadline is None:
+                            deadline = time.monotonic() + self._wait_timeout
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError("接続プールの空きを待つ間にタイムアウトしました")
+                        self._available.wait(remaining)
+                        continue
+                
+                if conn is None:
+                    return self._open_connection()
+                if self._is_reusable(conn, last_used):
                     return conn
-            
-            # プールが満杯の場合は待機
-            conn = self._pool.get(timeout=30)
-            if self._is_connection_valid(conn):
-                return conn
-            else:
-                conn.close()
-                return self.get_connection()
+                self._discard_connection(conn)
                 
         except Exception as e:
             error_handler.handle_error(ErrorCode.DB_CONNECTION_FAILED, e)
             return None
     
+    def _open_connection(self) -> pyodbc.Connection:
+        """確保済みの枠で新しい接続を作成（失敗した場合は枠を戻す）"""
+        try:
+            # 参照クエリのみのため、文ごとのトランザクション管理は行わない
+            return pyodbc.connect(self.connection_string, autocommit=True)
+        except BaseException:
+            with self._available:
+                self._active_connections -= 1
+                self._available.notify()
+            raise
+    
     def return_connection(self, conn: pyodbc.Connection):
-        """接続をプールに返却"""
-        if conn and self._is_connection_valid(conn):
-            try:
-                self._pool.put_nowait(conn)
-            except:
-                conn.close()
-                with self._lock:
-                    self._active_connections -= 1
+        """接続をプールに返却
+
+        有効性は次に取り出すときに確認するため、返却時には問い合わせを行わない。
+        """
+        if conn:
+            with self._available:
+                if len(self._pool) < self.max_connections:
+                    self._pool.append((conn, time.monotonic()))
+                    self._available.notify()
+                    return
+            self._discard_connection(conn)
+    
+    def _discard_connection(self, conn: pyodbc.Connection):
+        """接続を閉じて使用中の接続数から外す"""
+        try:
+            conn.close()
+        except pyodbc.Error:
+            pass
+        with self._available:
+            self._active_connections -= 1
+            self._available.notify()
+    
+    def _is_reusable(self, conn: pyodbc.Connection, last_used: float) -> bool:
+        """取り出した接続を再利用できるか（直前まで使われていた接続は確認を省く）"""
+        if time.monotonic() - last_used <= self._idle_check_seconds:
+            return True
+        return self._is_connection_valid(conn)
     
     def _is_connection_valid(self, conn: pyodbc.Connection) -> bool:
         """接続の有効性チェック"""
@@ -82,48 +113,19 @@ class ConnectionPool:
         except:
             return False
     
-    def _perform_health_check(self):
-        """ヘルスチェックの実行"""
-        current_time = time.time()
-        if current_time - self._last_health_check < self._health_check_interval:
-            return
-        
-        self._last_health_check = current_time
-        
-        # プール内の接続をチェック
-        valid_connections = []
-        while not self._pool.empty():
-            try:
-                conn = self._pool.get_nowait()
-                if self._is_connection_valid(conn):
-                    valid_connections.append(conn)
-                else:
-                    conn.close()
-                    with self._lock:
-                        self._active_connections -= 1
-            except Empty:
-                break
-        
-        # 有効な接続をプールに戻す
-        for conn in valid_connections:
-            try:
-                self._pool.put_nowait(conn)
-            except:
-                conn.close()
-                with self._lock:
-                    self._active_connections -= 1
-    
     def close_all(self):
         """すべての接続を閉じる"""
-        while not self._pool.empty():
+        with self._available:
+            pooled = list(self._pool)
+            self._pool.clear()
+            self._active_connections = 0
+            self._available.notify_all()
+        
+        for conn, _ in pooled:
             try:
-                conn = self._pool.get_nowait()
                 conn.close()
-            except Empty:
-                break
-        
-        with self._lock:
-            self._active_connections = 0
+            except pyodbc.Error:
+                pass
 
 
 class DatabaseManager:
@@ -250,8 +252,8 @@ class DatabaseManager:
                     "WHERE [品番] IS NOT NULL AND [品番] <> '' "
                     "ORDER BY [品番]"
                 )
-                rows = cursor.execute(sql).fetchall()
-                return [row[0] for row in rows if row[0]]
+                # fetchall で行オブジェクトの一覧を作らず、カーソルから品番の列だけを取り出す
+                return [number for number in map(itemgetter(0), cursor.execute(sql)) if number]
         except pyodbc.Error as e:
             error_handler.handle_error(ErrorCode.DB_QUERY_FAILED, e)
             return None
@@ -267,9 +269,9 @@ class DatabaseManager:
         
         try:
             with conn.cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) FROM t_不具合情報")
-                count = cursor.fetchone()[0]
-                return True, f"接続成功: {count}件のレコードを確認"
+                # 件数は数えず、テーブルを読めることだけを先頭1行で確認する
+                cursor.execute("SELECT TOP 1 1 FROM t_不具合情報").fetchone()
+                return True, "接続成功: 不具合情報テーブルを確認しました"
         except pyodbc.Error as e:
             error_handler.handle_error(ErrorCode.DB_QUERY_FAILED, e)
             return False, f"テーブルアクセスエラー: {str(e)}"
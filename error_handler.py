@@ -6,7 +6,9 @@
 import traceback
 import sys
 import os
+import threading
 from enum import Enum
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 from tkinter import messagebox
 from security_manager import SecurityManager
@@ -43,9 +45,34 @@ class ErrorCode(Enum):
 class ErrorHandler:
     """統一エラーハンドリングクラス"""
     
+    # エラーコード別のメッセージ（定型文のないエラーは例外の内容を表示する）
+    _MESSAGES = MappingProxyType({
+        ErrorCode.DB_CONNECTION_FAILED: "データベースに接続できませんでした。\n設定を確認してください。",
+        ErrorCode.DB_QUERY_FAILED: "データベースのクエリ実行に失敗しました。",
+        ErrorCode.DB_ACCESS_DENIED: "データベースファイルにアクセスできません。\nファイルの権限を確認してください。",
+        ErrorCode.DB_TIMEOUT: "データベース接続がタイムアウトしました。\nしばらく待ってから再試行してください。",
+        ErrorCode.CALCULATION_ERROR: "計算処理中にエラーが発生しました。",
+        ErrorCode.CALCULATION_OVERFLOW: "計算結果が処理可能な範囲を超えました。",
+        ErrorCode.INVALID_INPUT: "入力値が正しくありません。",
+        ErrorCode.FILE_ACCESS_DENIED: "ファイルにアクセスできません。",
+        ErrorCode.FILE_NOT_FOUND: "ファイルが見つかりません。",
+        ErrorCode.FILE_CORRUPTED: "ファイルが破損している可能性があります。",
+        ErrorCode.CONFIG_INVALID: "設定値が無効です。",
+        ErrorCode.CONFIG_SAVE_FAILED: "設定の保存に失敗しました。",
+        ErrorCode.SYSTEM_ERROR: "システムエラーが発生しました。",
+        ErrorCode.MEMORY_ERROR: "メモリ不足が発生しました。",
+        ErrorCode.THREAD_ERROR: "スレッド処理中にエラーが発生しました。"
+    })
+    
     def __init__(self):
         self.security_manager = SecurityManager()
         self._error_counts = {}
+        # メインスレッド以外で発生したエラーの表示に使う Tk ルート
+        self._ui_root = None
+    
+    def set_ui_root(self, root):
+        """エラー表示をメインループへ渡すための Tk ルートを登録"""
+        self._ui_root = root
     
     
     def handle_error(self, 
@@ -96,31 +123,18 @@ class ErrorHandler:
     
     def _show_user_message(self, error_code: ErrorCode, error: Exception, context: Optional[Dict[str, Any]]):
         """ユーザー向けエラーメッセージの表示"""
-        sanitized_error = self.security_manager.sanitize_error_message(str(error))
-        
-        # エラーコード別のメッセージ
-        messages = {
-            ErrorCode.DB_CONNECTION_FAILED: "データベースに接続できませんでした。\n設定を確認してください。",
-            ErrorCode.DB_QUERY_FAILED: "データベースのクエリ実行に失敗しました。",
-            ErrorCode.DB_ACCESS_DENIED: "データベースファイルにアクセスできません。\nファイルの権限を確認してください。",
-            ErrorCode.DB_TIMEOUT: "データベース接続がタイムアウトしました。\nしばらく待ってから再試行してください。",
-            ErrorCode.CALCULATION_ERROR: "計算処理中にエラーが発生しました。",
-            ErrorCode.CALCULATION_OVERFLOW: "計算結果が処理可能な範囲を超えました。",
-            ErrorCode.INVALID_INPUT: "入力値が正しくありません。",
-            ErrorCode.FILE_ACCESS_DENIED: "ファイルにアクセスできません。",
-            ErrorCode.FILE_NOT_FOUND: "ファイルが見つかりません。",
-            ErrorCode.FILE_CORRUPTED: "ファイルが破損している可能性があります。",
-            ErrorCode.CONFIG_INVALID: "設定値が無効です。",
-            ErrorCode.CONFIG_SAVE_FAILED: "設定の保存に失敗しました。",
-            ErrorCode.SYSTEM_ERROR: "システムエラーが発生しました。",
-            ErrorCode.MEMORY_ERROR: "メモリ不足が発生しました。",
-            ErrorCode.THREAD_ERROR: "スレッド処理中にエラーが発生しました。"
-        }
-        
         title = f"エラー ({error_code.value})"
-        message = messages.get(error_code, f"予期しないエラーが発生しました:\n{sanitized_error}")
+        message = self._MESSAGES.get(error_code)
+        if message is None:
+            # 定型文のないエラーだけ、例外の内容をマスクして表示する
+            sanitized_error = self.security_manager.sanitize_error_message(str(error))
+            message = f"予期しないエラーが発生しました:\n{sanitized_error}"
         
-        messagebox.showerror(title, message)
+        if self._ui_root is None or threading.current_thread() is threading.main_thread():
+            messagebox.showerror(title, message)
+        else:
+            # Tk はメインスレッド以外から操作できないため、表示はメインループで行う
+            self._ui_root.after(0, messagebox.showerror, title, message)
     
     def get_error_count(self, error_code: ErrorCode) -> int:
         """エラー発生回数の取得"""
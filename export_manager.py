@@ -3,11 +3,25 @@
 結果のテキストエクスポート機能を管理
 """
 
+import os
 from tkinter import filedialog, messagebox
 from datetime import datetime
 from security_manager import SecurityManager
 
 
+def _write_text_file(filepath, sections):
+    """テキストを区切りごとに UTF-8 で書き込む（全体を1つの文字列に連結しない）
+
+    改行はテキストモードで書き込んだ場合と同じく OS の形式にする。
+    """
+    convert_newlines = os.linesep != "\n"
+    with open(filepath, 'wb') as f:
+        f.writelines(
+            (section.replace("\n", os.linesep) if convert_newlines else section).encode('utf-8')
+            for section in sections
+        )
+
+
 class ExportManager:
     """エクスポート管理クラス"""
     
@@ -17,106 +31,113 @@ class ExportManager:
     
     def export_results(self):
         """結果のエクスポート（従来のテキスト出力）"""
-        if not hasattr(self.app.controller, 'last_db_data') or not self.app.controller.last_db_data: 
+        controller = self.app.controller
+        db_data = getattr(controller, 'last_db_data', None)
+        if not db_data: 
             messagebox.showinfo("エクスポート不可", "先に計算を実行してください。")
             return
         
+        stats_results = controller.last_stats_results
+        inputs = controller.last_inputs
+        ui_manager = controller.ui_manager
+        
         # 不具合データがない場合の特別処理
-        if self.app.controller.last_stats_results.get('no_defect_data', False):
+        if stats_results.get('no_defect_data', False):
             self._export_no_defect_data_results()
             return
             
         # 結果テキストの生成
-        texts = self.app.controller.ui_manager.generate_result_texts(
-            self.app.controller.last_db_data, 
-            self.app.controller.last_stats_results, 
-            self.app.controller.last_inputs
-        )
-        sample_size_disp = self.app.controller.ui_manager.format_int(self.app.controller.last_stats_results['sample_size'])
+        texts = ui_manager.generate_result_texts(db_data, stats_results, inputs)
+        sample_size_disp = ui_manager.format_int(stats_results['sample_size'])
         
-        content = f"""AI SQC Sampler - 計算結果（AQL/LTPD設計）
+        header = f"""AI SQC Sampler - 計算結果（AQL/LTPD設計）
 計算日時: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 {'=' * 60}
 
-品番: {self.app.controller.last_inputs['product_number']}
-ロットサイズ: {self.app.controller.ui_manager.format_int(self.app.controller.last_inputs['lot_size'])}個
-不具合率: {self.app.controller.last_db_data['defect_rate']:.2f}%
-検査水準: {self.app.controller.last_stats_results['level_text']}
+品番: {inputs['product_number']}
+ロットサイズ: {ui_manager.format_int(inputs['lot_size'])}個
+不具合率: {db_data['defect_rate']:.2f}%
+検査水準: {stats_results['level_text']}
 サンプルサイズ: {sample_size_disp} 個
 
 【AQL/LTPD設計パラメータ】
-AQL（合格品質水準）: {self.app.controller.last_stats_results.get('aql', self.app.controller.last_inputs.get('aql', 0.25)):.3f}%
-LTPD（不合格品質水準）: {self.app.controller.last_stats_results.get('ltpd', self.app.controller.last_inputs.get('ltpd', 1.0)):.3f}%
-α（生産者危険）: {self.app.controller.last_inputs.get('alpha', 5.0):.1f}%
-β（消費者危険）: {self.app.controller.last_inputs.get('beta', 10.0):.1f}%
-c値（許容不良数）: {self.app.controller.last_inputs.get('c_value', 0)}
-
-{texts['review']}
+AQL（合格品質水準）: {stats_results.get('aql', inputs.get('aql', 0.25)):.3f}%
+LTPD（不合格品質水準）: {stats_results.get('ltpd', inputs.get('ltpd', 1.0)):.3f}%
+α（生産者危険）: {inputs.get('alpha', 5.0):.1f}%
+β（消費者危険）: {inputs.get('beta', 10.0):.1f}%
+c値（許容不良数）: {inputs.get('c_value', 0)}
 
-{texts['best5']}
-
-{self._get_adjustment_info()}
-
-{self._get_guidance_info()}
 """
+        # 長くなりやすい分析結果の本文は連結せず、見出し部分と並べてそのまま書き出す
+        sections = (
+            header,
+            texts['review'], "\n\n",
+            texts['best5'], "\n\n",
+            self._get_adjustment_info(), "\n\n",
+            self._get_guidance_info(), "\n"
+        )
         
+        self._save_text_report(sections, f"検査結果_{inputs['product_number']}.txt")
+    
+    def _save_text_report(self, sections, initialfile):
+        """保存先を選ばせてテキストレポートを書き出す（sections は順に書き込む文字列）"""
         try:
             filepath = filedialog.asksaveasfilename(
                 title="結果を名前を付けて保存",
                 defaultextension=".txt",
                 filetypes=[("テキストファイル", "*.txt"), ("すべてのファイル", "*.*")],
-                initialfile=f"検査結果_{self.app.controller.last_inputs['product_number']}.txt"
+                initialfile=initialfile
             )
             if not filepath: 
                 return
-            with open(filepath, 'w', encoding='utf-8') as f: 
-                f.write(content)
+            _write_text_file(filepath, sections)
             messagebox.showinfo("成功", f"結果を保存しました。\nパス: {filepath}")
         except Exception as e:
             sanitized_error = self.security_manager.sanitize_error_message(str(e))
             messagebox.showerror("エクスポート失敗", f"ファイルの保存中にエラーが発生しました: {sanitized_error}")
     
-    
-    
     def _get_adjustment_info(self):
         """調整情報の取得"""
-        if 'adjustment_info' in self.app.controller.last_stats_results and self.app.controller.last_stats_results['adjustment_info']:
-            return self.app.controller.last_stats_results['adjustment_info']
-        return ""
+        return self.app.controller.last_stats_results.get('adjustment_info') or ""
     
     def _get_guidance_info(self):
         """ガイダンス情報の取得"""
+        stats_results = self.app.controller.last_stats_results
         guidance_parts = []
         
-        if 'guidance_message' in self.app.controller.last_stats_results and self.app.controller.last_stats_results['guidance_message']:
-            guidance_parts.append(self.app.controller.last_stats_results['guidance_message'])
+        guidance_message = stats_results.get('guidance_message')
+        if guidance_message:
+            guidance_parts.append(guidance_message)
         
-        if 'warning_message' in self.app.controller.last_stats_results and self.app.controller.last_stats_results['warning_message']:
-            guidance_parts.append(f"【警告】\n{self.app.controller.last_stats_results['warning_message']}")
+        warning_message = stats_results.get('warning_message')
+        if warning_message:
+            guidance_parts.append(f"【警告】\n{warning_message}")
         
         return "\n\n".join(guidance_parts) if guidance_parts else ""
     
     def _export_no_defect_data_results(self):
         """不具合データがない場合の結果エクスポート"""
-        lot_size = self.app.controller.last_inputs.get('lot_size', 1000)
-        sample_size_disp = self.app.controller.ui_manager.format_int(lot_size)
+        inputs = self.app.controller.last_inputs
+        lot_size_disp = self.app.controller.ui_manager.format_int(inputs.get('lot_size', 1000))
+        aql = inputs.get('aql', 0.25)
+        ltpd = inputs.get('ltpd', 1.0)
         
         content = f"""AI SQC Sampler - 計算結果（全数検査推奨）
 計算日時: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 {'=' * 60}
 
-品番: {self.app.controller.last_inputs['product_number']}
-ロットサイズ: {self.app.controller.ui_manager.format_int(lot_size)}個
+品番: {inputs['product_number']}
+ロットサイズ: {lot_size_disp}個
 不具合率: 0.00%
 検査水準: 全数検査推奨
-サンプルサイズ: {sample_size_disp} 個
+サンプルサイズ: {lot_size_disp} 個
 
 【AQL/LTPD設計パラメータ】
-AQL（合格品質水準）: {self.app.controller.last_inputs.get('aql', 0.25):.3f}%
-LTPD（不合格品質水準）: {self.app.controller.last_inputs.get('ltpd', 1.0):.3f}%
-α（生産者危険）: {self.app.controller.last_inputs.get('alpha', 5.0):.1f}%
-β（消費者危険）: {self.app.controller.last_inputs.get('beta', 10.0):.1f}%
-c値（許容不良数）: {self.app.controller.last_inputs.get('c_value', 0)}
+AQL（合格品質水準）: {aql:.3f}%
+LTPD（不合格品質水準）: {ltpd:.3f}%
+α（生産者危険）: {inputs.get('alpha', 5.0):.1f}%
+β（消費者危険）: {inputs.get('beta', 10.0):.1f}%
+c値（許容不良数）: {inputs.get('c_value', 0)}
 
 【検査時の注意喚起】
 該当期間に不具合データがありません。
@@ -126,8 +147,8 @@ c値（許容不良数）: {self.app.controller.last_inputs.get('c_value', 0)}
 実績不良率: 0.000%
 
 元の設定:
-• AQL: {self.app.controller.last_inputs.get('aql', 0.25):.3f}%
-• LTPD: {self.app.controller.last_inputs.get('ltpd', 1.0):.3f}%
+• AQL: {aql:.3f}%
+• LTPD: {ltpd:.3f}%
 
 推奨理由: 不具合データ（実績）がありません。統計的抜取検査の根拠となる実績データが不足しているため、全数検査を推奨します。
 効果: 品質保証の確実性、不良品流出の完全防止
@@ -136,18 +157,6 @@ c値（許容不良数）: {self.app.controller.last_inputs.get('c_value', 0)}
 実績データが不足しているため、統計的抜取検査ではなく全数検査を実施してください。
 """
         
-        try:
-            filepath = filedialog.asksaveasfilename(
-                title="結果を名前を付けて保存",
-                defaultextension=".txt",
-                filetypes=[("テキストファイル", "*.txt"), ("すべてのファイル", "*.*")],
-                initialfile=f"検査結果_{self.app.controller.last_inputs['product_number']}_全数検査推奨.txt"
-            )
-            if not filepath: 
-                return
-            with open(filepath, 'w', encoding='utf-8') as f: 
-                f.write(content)
-            messagebox.showinfo("成功", f"結果を保存しました。\nパス: {filepath}")
-        except Exception as e:
-            sanitized_error = self.security_manager.sanitize_error_message(str(e))
-            messagebox.showerror("エクスポート失敗", f"ファイルの保存中にエラーが発生しました: {sanitized_error}")
\ No newline at end of file
+        self._save_text_report(
+            (content,), f"検査結果_{inputs['product_number']}_全数検査推奨.txt"
+        )
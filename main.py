@@ -38,6 +38,8 @@ class MainController:
             self.security_manager = SecurityManager()
             self.db_manager = DatabaseManager(self.config_manager)
             self.app = App(self)
+            # DB 処理などワーカースレッドで発生したエラーもメインループから表示する
+            error_handler.set_ui_root(self.app)
             
             # 各マネージャーの初期化
             self.calculation_engine = CalculationEngine(self.db_manager)
@@ -237,14 +239,18 @@ class MainController:
 
     def open_config_dialog(self):
         """設定ダイアログの表示"""
+        previous_db_path = self.config_manager.get_database_path()
         dialog = SettingsDialog(self.app, self.config_manager)
         dialog.show()
         
-        # 設定変更後、データベースマネージャーを再初期化
-        self.db_manager = DatabaseManager(self.config_manager)
-        self.calculation_engine = CalculationEngine(self.db_manager)
-        self.progress_manager = ProgressManager(self.app, self.db_manager, self.calculation_engine, self.ui_manager)
-        self.product_list_manager = ProductListManager(self.app, self.db_manager)
+        # データベースパスが変わった場合のみ、データベースマネージャーを再初期化
+        # （変わっていなければ確立済みの接続プールと接続文字列をそのまま使う）
+        if self.config_manager.get_database_path() != previous_db_path:
+            self.db_manager.close_all_connections()
+            self.db_manager = DatabaseManager(self.config_manager)
+            self.calculation_engine = CalculationEngine(self.db_manager)
+            self.progress_manager = ProgressManager(self.app, self.db_manager, self.calculation_engine, self.ui_manager)
+            self.product_list_manager = ProductListManager(self.app, self.db_manager)
 
         # 検査区分の反映と入力欄の更新
         if hasattr(self.config_manager, "get_inspection_mode"):
@@ -10,7 +10,7 @@ import psutil
 import os
 import sys
 from typing import Dict, Any, Optional
-from collections import deque
+from collections import OrderedDict, deque
 
 
 class MemoryManager:
@@ -19,8 +19,8 @@ class MemoryManager:
     def __init__(self, max_cache_size: int = 100, gc_threshold: int = 50):
         self.max_cache_size = max_cache_size
         self.gc_threshold = gc_threshold
-        self._cache = {}
-        self._cache_access_times = {}
+        # 参照順（古い順）に並べたキャッシュ。参照・保存のたびに末尾へ移す
+        self._cache = OrderedDict()
         self._lock = threading.Lock()
         self._memory_usage_history = deque(maxlen=100)
         self._last_gc_time = 0
@@ -57,7 +57,7 @@ class MemoryManager:
                     'timestamp': time.time(),
                     'max_age': max_age
                 }
-                self._cache_access_times[key] = time.time()
+                self._cache.move_to_end(key)
                 
                 # ログ機能を無効化
                 return True
@@ -79,12 +79,10 @@ class MemoryManager:
                 # 有効期限のチェック
                 if current_time - cache_item['timestamp'] > cache_item['max_age']:
                     del self._cache[key]
-                    if key in self._cache_access_times:
-                        del self._cache_access_times[key]
                     return None
                 
-                # アクセス時間の更新
-                self._cache_access_times[key] = current_time
+                # 最近参照したものとして末尾へ移す
+                self._cache.move_to_end(key)
                 
                 # ログ機能を無効化
                 return cache_item['data']
@@ -107,7 +105,6 @@ class MemoryManager:
             ]
             for key in expired_keys:
                 self._cache.pop(key, None)
-                self._cache_access_times.pop(key, None)
 
             cache_size = len(self._cache)
             if cache_size < self.max_cache_size:
@@ -117,14 +114,9 @@ class MemoryManager:
             if removal_count <= 0:
                 return
 
-            sorted_keys = sorted(
-                self._cache_access_times.items(),
-                key=lambda item: item[1]
-            )
-
-            for key, _ in sorted_keys[:removal_count]:
-                self._cache.pop(key, None)
-                self._cache_access_times.pop(key, None)
+            # 先頭が最も長く参照されていないもの
+            for _ in range(removal_count):
+                self._cache.popitem(last=False)
 
         except Exception as e:
             # ログ機能を無効化
@@ -135,7 +127,6 @@ class MemoryManager:
         try:
             with self._lock:
                 self._cache.clear()
-                self._cache_access_times.clear()
                 # ログ機能を無効化
                 pass
         except Exception as e:
@@ -194,14 +185,8 @@ class MemoryManager:
                     return
 
                 removal_count = cache_size // 2
-                sorted_keys = sorted(
-                    self._cache_access_times.items(),
-                    key=lambda item: item[1]
-                )
-
-                for key, _ in sorted_keys[:removal_count]:
-                    self._cache.pop(key, None)
-                    self._cache_access_times.pop(key, None)
+                for _ in range(removal_count):
+                    self._cache.popitem(last=False)
     
             # 強制的なガベージコレクション
             gc.collect()
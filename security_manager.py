@@ -4,6 +4,7 @@
 """
 
 import os
+import re
 import sys
 import hashlib
 import base64
@@ -12,6 +13,24 @@ from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 
+# パスに含まれてはならない文字列（'..' と1文字の記号）をまとめて1回の走査で検出する
+_DANGEROUS_PATH_PATTERN = re.compile(r"\.\.|[~$`|&;()<>]")
+# 入力値に使用できない文字（エラーメッセージではこの順で最初に見つかった文字を示す）
+_DANGEROUS_INPUT_CHARS = ('<', '>', '"', "'", '&', ';', '|', '`', '$')
+_DANGEROUS_INPUT_CHAR_SET = frozenset(_DANGEROUS_INPUT_CHARS)
+# エラーメッセージ中でマスクする文字列（この順に置き換える）
+_SENSITIVE_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'password', r'passwd', r'pwd',
+        r'token', r'key', r'secret',
+        r'connection', r'connect',
+        r'database', r'db',
+        r'file://', r'http://', r'https://'
+    )
+)
+
+
 class SecurityManager:
     """セキュリティ管理クラス"""
     
@@ -81,11 +100,9 @@ class SecurityManager:
             return None
         
         # 危険な文字を除去
-        dangerous_chars = ['..', '~', '$', '`', '|', '&', ';', '(', ')', '<', '>']
-        for char in dangerous_chars:
-            if char in path:
-                # ログ機能を無効化
-                return None
+        if _DANGEROUS_PATH_PATTERN.search(path):
+            # ログ機能を無効化
+            return None
         
         # パスの正規化
         try:
@@ -125,18 +142,9 @@ class SecurityManager:
     def sanitize_error_message(self, error_message):
         """エラーメッセージのサニタイズ"""
         # 機密情報を含む可能性のある文字列をマスク
-        sensitive_patterns = [
-            r'password', r'passwd', r'pwd',
-            r'token', r'key', r'secret',
-            r'connection', r'connect',
-            r'database', r'db',
-            r'file://', r'http://', r'https://'
-        ]
-        
-        import re
         sanitized = error_message
-        for pattern in sensitive_patterns:
-            sanitized = re.sub(pattern, '[MASKED]', sanitized, flags=re.IGNORECASE)
+        for pattern in _SENSITIVE_PATTERNS:
+            sanitized = pattern.sub('[MASKED]', sanitized)
         
         return sanitized
     
@@ -150,15 +158,17 @@ class SecurityManager:
         if not input_data:
             return False, "入力値が空です"
         
+        text = str(input_data)
+
         # 文字列長の制限
-        if len(str(input_data)) > 1000:
+        if len(text) > 1000:
             return False, "入力値が長すぎます"
         
-        # 危険な文字のチェック
-        dangerous_chars = ['<', '>', '"', "'", '&', ';', '|', '`', '$']
-        for char in dangerous_chars:
-            if char in str(input_data):
-                self.log_security_event("DANGEROUS_INPUT", f"危険な文字検出: {char}")
-                return False, f"使用できない文字が含まれています: {char}"
+        # 危険な文字のチェック（含まれない通常の入力は集合との比較1回で済ませる）
+        if not _DANGEROUS_INPUT_CHAR_SET.isdisjoint(text):
+            for char in _DANGEROUS_INPUT_CHARS:
+                if char in text:
+                    self.log_security_event("DANGEROUS_INPUT", f"危険な文字検出: {char}")
+                    return False, f"使用できない文字が含まれています: {char}"
         
         return True, "OK"
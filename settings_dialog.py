@@ -352,11 +352,11 @@ class SettingsDialog:
             
             conn = pyodbc.connect(conn_str)
             with conn.cursor() as cursor:
-                cursor.execute("SELECT COUNT(*) FROM t_不具合情報")
-                count = cursor.fetchone()[0]
+                # 件数は数えず、テーブルを読めることだけを先頭1行で確認する
+                cursor.execute("SELECT TOP 1 1 FROM t_不具合情報").fetchone()
             conn.close()
             
-            messagebox.showinfo("接続テスト成功", f"✅ データベース接続に成功しました！\n\nレコード数: {count}件")
+            messagebox.showinfo("接続テスト成功", "✅ データベース接続に成功しました！\n\n不具合情報テーブルを確認しました。")
             
         except pyodbc.Error as e:
             if "Microsoft Access Driver" in str(e):
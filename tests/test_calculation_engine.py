@@ -0,0 +1,106 @@
+"""
+calculation_engine の抜取数探索のテスト
+"""
+
+import itertools
+import unittest
+
+import calculation_engine
+from calculation_engine import CalculationEngine, _acceptance_probability, _search_min_sample_size
+
+
+def _alternative_designs(aql, ltpd, alpha, beta, c_value):
+    """calculate_alternatives と同じ代替案の条件一覧"""
+    return (
+        [(new_aql, ltpd, alpha, beta, c_value) for new_aql in (0.4, 0.65, 1.0, 1.5)]
+        + [(aql, new_ltpd, alpha, beta, c_value) for new_ltpd in (0.5, 0.8, 1.2, 1.5)]
+        + [(aql, ltpd, new_alpha, new_beta, c_value)
+           for new_alpha, new_beta in ((10.0, 5.0), (5.0, 5.0), (10.0, 10.0), (15.0, 10.0))]
+        + [(aql, ltpd, alpha, beta, new_c) for new_c in (1, 2, 3)]
+    )
+
+
+def _linear_scan_sample_size(aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size):
+    """n = 1 から順に調べて両条件を満たす最小の抜取数（なければ None）"""
+    for n in range(1, min(lot_size, 10000) + 1):
+        if (_acceptance_probability(n, ltpd_p, c_value, lot_size) <= beta_p
+                and _acceptance_probability(n, aql_p, c_value, lot_size) >= 1 - alpha_p):
+            return n
+    return None
+
+
+class SearchMinSampleSizeTest(unittest.TestCase):
+    """_search_min_sample_size が両条件を満たす最小の抜取数を返すことを確認する"""
+
+    # (AQL[%], LTPD[%], α[%], β[%], c, ロットサイズ) と期待する抜取数
+    KNOWN_DESIGNS = (
+        ((0.15, 8.0, 3.0, 20.0, 0, 800), 20),
+        ((0.01, 1.5, 10.0, 5.0, 0, 3000), 192),
+        ((0.4, 10.0, 5.0, 5.0, 1, 3000), 46),
+        # n/N = 0.1 の切り替わり（N = 300 では n = 30 まで二項分布、31 から超幾何分布）
+        ((0.01, 4.0, 5.0, 30.0, 0, 300), 30),
+        ((0.01, 3.5, 15.0, 30.0, 0, 300), 31),
+        ((0.01, 4.0, 5.0, 20.0, 0, 400), 40),
+        ((0.4, 10.0, 5.0, 20.0, 2, 400), 41),
+        # n = 50 の切り替わり（N = 1000 では n = 50 まで二項分布、51 から超幾何分布）
+        ((0.01, 15.0, 5.0, 5.0, 3, 1000), 50),
+        ((0.25, 5.0, 10.0, 10.0, 0, 1000), 51),
+    )
+
+    def setUp(self):
+        _search_min_sample_size.cache_clear()
+
+    def test_known_designs(self):
+        for (aql, ltpd, alpha, beta, c_value, lot_size), expected in self.KNOWN_DESIGNS:
+            with self.subTest(design=(aql, ltpd, alpha, beta, c_value, lot_size)):
+                self.assertEqual(
+                    _search_min_sample_size(aql / 100, ltpd / 100, alpha / 100, beta / 100, c_value, lot_size),
+                    expected,
+                )
+
+    def test_matches_linear_scan(self):
+        grid = itertools.product(
+            (0.01, 0.25, 1.0), (1.5, 5.0, 10.0), (5.0, 10.0), (5.0, 20.0), (0, 1, 3), (60, 300, 800)
+        )
+        for aql, ltpd, alpha, beta, c_value, lot_size in grid:
+            args = (aql / 100, ltpd / 100, alpha / 100, beta / 100, c_value, lot_size)
+            with self.subTest(design=(aql, ltpd, alpha, beta, c_value, lot_size)):
+                self.assertEqual(_search_min_sample_size(*args), _linear_scan_sample_size(*args))
+
+
+class AlternativeSampleSizesTest(unittest.TestCase):
+    """代替案のまとめ計算が1条件ずつの探索と同じ結果になることを確認する"""
+
+    CURRENT_DESIGNS = (
+        (0.25, 1.0, 5.0, 10.0, 0),
+        (0.1, 0.5, 5.0, 10.0, 0),
+        (0.4, 2.0, 10.0, 20.0, 1),
+        (1.0, 5.0, 5.0, 10.0, 2),
+        (0.01, 1.5, 10.0, 5.0, 0),
+    )
+    LOT_SIZES = (11, 30, 60, 200, 501, 800, 3000, 20000, 100000)
+
+    def setUp(self):
+        calculation_engine._SAMPLE_SIZE_CACHE.clear()
+        _search_min_sample_size.cache_clear()
+
+    def test_batch_matches_single_search(self):
+        engine = CalculationEngine(None)
+        for current in self.CURRENT_DESIGNS:
+            for lot_size in self.LOT_SIZES:
+                designs = _alternative_designs(*current)
+                with self.subTest(current=current, lot_size=lot_size):
+                    calculation_engine._SAMPLE_SIZE_CACHE.clear()
+                    expected = []
+                    for aql, ltpd, alpha, beta, c_value in designs:
+                        aql_p, ltpd_p, alpha_p, beta_p = aql / 100, ltpd / 100, alpha / 100, beta / 100
+                        best_n = _search_min_sample_size(aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size)
+                        n_sample, warning = engine._resolve_searched_sample_size(
+                            best_n, aql_p, ltpd_p, alpha_p, beta_p, c_value, lot_size
+                        )
+                        expected.append(engine._apply_lot_size_limit(n_sample, warning, lot_size))
+                    self.assertEqual(engine._calculate_aql_ltpd_sample_sizes(designs, lot_size), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+"""
+constants の検査水準判定のテスト
+"""
+
+import unittest
+
+from constants import InspectionConstants
+
+
+class GetInspectionLevelTest(unittest.TestCase):
+    """get_inspection_level が従来の if 文と同じ区分を返すことを確認する"""
+
+    def assertLevel(self, defect_rate, level):
+        self.assertIs(
+            InspectionConstants.get_inspection_level(defect_rate),
+            InspectionConstants.INSPECTION_LEVELS[level],
+        )
+
+    def test_thresholds(self):
+        self.assertLevel(0, 'loose')
+        self.assertLevel(0.0001, 'normal')
+        self.assertLevel(InspectionConstants.DEFECT_RATE_THRESHOLD_NORMAL, 'normal')
+        self.assertLevel(InspectionConstants.DEFECT_RATE_THRESHOLD_NORMAL + 0.0001, 'strict')
+
+    def test_out_of_range_rates(self):
+        self.assertLevel(-0.1, 'normal')
+        self.assertLevel(float('nan'), 'strict')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,12 +8,16 @@ UI管理モジュール
 
 
 
+import threading
+
 import tkinter as tk
 
 from tkinter import messagebox
 
 from datetime import datetime
 
+from error_handler import error_handler, ErrorCode
+
 
 
 
@@ -865,19 +869,69 @@ class UIManager:
 
         
 
-        # 代替案の計算
+        # 代替案の計算（画面を止めないようワーカースレッドで行い、表示はメインスレッドで更新）
+
+        text_widget.insert('1.0', "代替案を計算中...")
+
+        text_widget.config(state='disabled')
+
+        
+
+        def show_alternatives(alternatives_text):
+
+            # 計算中にダイアログが閉じられた場合は何もしない
+
+            if not text_widget.winfo_exists():
+
+                return
+
+            text_widget.config(state='normal')
+
+            text_widget.delete('1.0', tk.END)
+
+            text_widget.insert('1.0', alternatives_text)
+
+            text_widget.config(state='disabled')
+
+        
 
-        alternatives_text = self.app.controller.calculation_engine.calculate_alternatives(
+        def alternatives_worker(calculation_engine, db_data, inputs):
 
-            self.app.controller.last_db_data, 
+            try:
 
-            self.app.controller.last_inputs
+                alternatives_text = calculation_engine.calculate_alternatives(db_data, inputs)
+
+            except Exception as e:
+
+                # エラー表示（messagebox）は Tk を操作するため、結果の表示と同じくメインスレッドへ渡す
+
+                self.app.after(0, error_handler.handle_error, ErrorCode.CALCULATION_ERROR, e)
+
+                alternatives_text = "代替案の計算に失敗しました。"
+
+            self.app.after(0, show_alternatives, alternatives_text)
+
+        
+
+        thread = threading.Thread(
+
+            target=alternatives_worker,
+
+            args=(
+
+                self.app.controller.calculation_engine,
+
+                self.app.controller.last_db_data,
+
+                self.app.controller.last_inputs
+
+            )
 
         )
 
-        text_widget.insert('1.0', alternatives_text)
+        thread.daemon = True
 
-        text_widget.config(state='disabled')
+        thread.start()
 
         
 